@@ -1,11 +1,23 @@
+import ast
 import asyncio
+import csv
 import json
 import logging
 import os
 import datetime
+import functools
 import getpass
+import inspect
+import io
+import itertools
+import signal
 import sqlite3
-from collections import defaultdict
+import threading
+import time
+import types
+from collections import Counter, defaultdict
+from logging.handlers import MemoryHandler
+from operator import itemgetter
 
 import mcp.server.stdio
 from dotenv import load_dotenv
@@ -15,7 +27,17 @@ from mcp import types as mcp_types
 from mcp.server.lowlevel import NotificationOptions, Server
 from mcp.server.models import InitializationOptions
 import htcondor
-from typing import Optional
+from typing import Final, Optional
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; responses fall back to the stdlib encoder
+    orjson = None
+
+if orjson is not None:
+    # Reports use int (and None) dict keys, e.g. status distributions
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
 
 # Import simplified session context management - handle both relative and absolute imports
 try:
@@ -29,11 +51,17 @@ except ImportError:
 load_dotenv()
 
 LOG_FILE_PATH = os.path.join(os.path.dirname(__file__), "mcp_server_activity.log")
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s",
-    handlers=[logging.FileHandler(LOG_FILE_PATH, mode="w")],
+# Buffer records in memory so each tool call doesn't block the event loop on a file
+# write; errors flush immediately, the running server flushes every
+# _LOG_FLUSH_INTERVAL seconds and again on shutdown or SIGTERM
+_LOG_BUFFER_CAPACITY = 1024
+_LOG_FLUSH_INTERVAL = 1.0  # seconds
+_log_file_handler = logging.FileHandler(LOG_FILE_PATH, mode="w")
+_log_file_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s")
 )
+_log_buffer_handler = MemoryHandler(_LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=_log_file_handler)
+logging.basicConfig(level=logging.DEBUG, handlers=[_log_buffer_handler])
 
 logging.info("Creating MCP Server instance for HTCondor...")
 app = Server("htcondor-mcp-server")
@@ -41,31 +69,194 @@ app = Server("htcondor-mcp-server")
 # Initialize simplified session context management
 session_context_manager = get_simplified_session_context_manager()
 
+# Long-lived read connection for the session lookups below, so the page cache stays warm
+_session_db_conn = sqlite3.connect(session_context_manager.db_path, check_same_thread=False, isolation_level=None)
+_session_db_lock = threading.Lock()
+# It lives for the whole process, so a larger page cache and mmap keep lookups in memory
+_session_db_conn.execute("PRAGMA cache_size=-20000")
+_session_db_conn.execute("PRAGMA mmap_size=268435456")
+
+# Fixed SQL text, so the connection's statement cache reuses the prepared statements
+_LAST_ACTIVE_SESSION_SQL = """
+    SELECT session_id, created_at, last_activity 
+    FROM sessions 
+    WHERE user_id = ? AND is_active = 1 
+    ORDER BY last_activity DESC 
+    LIMIT 1
+"""
+
+# Active sessions with their conversation counts, most recently active first
+_USER_SESSIONS_SQL = """
+    SELECT s.session_id, s.created_at, s.last_activity, COUNT(c.conversation_id) as conversation_count
+    FROM sessions s 
+    LEFT JOIN conversations c ON s.session_id = c.session_id 
+    WHERE s.user_id = ? AND s.is_active = TRUE
+    GROUP BY s.session_id 
+    ORDER BY s.last_activity DESC
+"""
+
+# Status filter names accepted by the job tools, mapped to HTCondor JobStatus codes
+STATUS_MAP = types.MappingProxyType({
+    "running": 2, "idle": 1, "held": 5,
+    "completed": 4, "removed": 3,
+    "transferring_output": 6, "suspended": 7,
+})
+
+# Human-readable names for HTCondor JobStatus codes
+JOB_STATUS_NAMES = types.MappingProxyType({
+    1: "Idle", 2: "Running", 3: "Removed", 4: "Completed",
+    5: "Held", 6: "Transferring Output", 7: "Suspended",
+})
+
+# HTCondor JobUniverse codes and their names
+JOB_UNIVERSE_NAMES = types.MappingProxyType({
+    1: "Standard", 2: "Pipes", 3: "Linda", 4: "PVM",
+    5: "Vanilla", 6: "Scheduler", 7: "MPI", 9: "Grid",
+    10: "Java", 11: "Parallel", 12: "Local", 13: "Docker",
+})
+
+# Job ad attributes reported by get_job_status, with their display names
+JOB_STATUS_FIELDS = types.MappingProxyType({
+    "ClusterId": "Cluster ID",
+    "ProcId": "Process ID",
+    "JobStatus": "Job Status",
+    "Owner": "Owner",
+    "Cmd": "Command",
+    "Arguments": "Arguments",
+    "Iwd": "Working Directory",
+    "JobUniverse": "Job Universe",
+    "QDate": "Queue Date",
+    "JobStartDate": "Job Start Date",
+    "JobCurrentStartDate": "Current Start Date",
+    "RemoteHost": "Execution Host",
+    "RemoteUserCpu": "CPU Time Used",
+    "RemoteSysCpu": "System CPU Time",
+    "MemoryUsage": "Memory Used",
+    "DiskUsage": "Disk Used",
+    "RequestCpus": "Requested CPUs",
+    "RequestMemory": "Requested Memory",
+    "RequestDisk": "Requested Disk",
+    "JobPrio": "Job Priority",
+    "NumJobStarts": "Number of Starts",
+    "JobRunCount": "Run Count",
+    "ExitStatus": "Exit Status",
+    "WallClockCheckpoint": "Wall Clock Time",
+    "In": "Input File",
+    "Out": "Output File",
+    "Err": "Error File",
+    "UserLog": "Log File",
+})
+
+def _format_timestamp(v):
+    """Convert a Unix timestamp to readable format."""
+    if not v:
+        return v
+    try:
+        return datetime.datetime.fromtimestamp(v).isoformat()
+    except (ValueError, TypeError):
+        return v
+
+def _format_megabytes(v):
+    """Format a memory or disk size in MB with units."""
+    if not v:
+        return v
+    return f"{v} MB ({v//1024} GB)" if v >= 1024 else f"{v} MB"
+
+def _format_duration(v):
+    """Convert seconds to hours:minutes:seconds."""
+    if not v:
+        return v
+    try:
+        hours = int(v // 3600)
+        minutes = int((v % 3600) // 60)
+        seconds = int(v % 60)
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    except (ValueError, TypeError):
+        return v
+
+# Display formatting for the get_job_status fields that need it
+JOB_STATUS_FORMATTERS = types.MappingProxyType({
+    "JobStatus": lambda v: f"{v} ({JOB_STATUS_NAMES.get(v, 'Unknown')})",
+    "JobUniverse": lambda v: f"{v} ({JOB_UNIVERSE_NAMES.get(v, 'Unknown')})",
+    "QDate": _format_timestamp,
+    "JobStartDate": _format_timestamp,
+    "JobCurrentStartDate": _format_timestamp,
+    "RequestMemory": _format_megabytes,
+    "MemoryUsage": _format_megabytes,
+    "RequestDisk": _format_megabytes,
+    "DiskUsage": _format_megabytes,
+    "Arguments": lambda v: v or "(none)",
+    "In": lambda v: v or "(default)",
+    "Out": lambda v: v or "(default)",
+    "Err": lambda v: v or "(default)",
+    "WallClockCheckpoint": _format_duration,
+})
+
+# Job ad attributes get_job_history builds its events from
+JOB_HISTORY_ATTRS = ("QDate", "JobStartDate", "JobCurrentStartDate", "CompletionDate", "JobStatus")
+
+# Resource usage attributes reported by get_resource_usage for a single job
+JOB_RESOURCE_ATTRS = ("RemoteUserCpu", "RemoteSysCpu", "ImageSize",
+                      "MemoryUsage", "DiskUsage", "CommittedTime")
+
+# Only request JSON-safe fields for list_jobs
+LIST_JOB_ATTRS = ("ClusterId", "ProcId", "JobStatus", "Owner")
+
+# Machine status filter names accepted by list_machines, mapped to collector constraints
+MACHINE_STATE_CONSTRAINTS = types.MappingProxyType({
+    "available": "State == 'Unclaimed'",
+    "busy": "State == 'Claimed'",
+    "offline": "State == 'Owner'",
+})
+
+MACHINE_ATTRS = ("Name", "State", "Activity", "LoadAvg", "Memory", "Cpus")
+MACHINE_ATTRS_LOWER = tuple(a.lower() for a in MACHINE_ATTRS)
+
+# Projections for the reporting tools, with the lowercased keys used in their output
+JOB_REPORT_ATTRS = ("ClusterId", "ProcId", "JobStatus", "Owner", "QDate", "RemoteUserCpu",
+                    "RemoteSysCpu", "ImageSize", "MemoryUsage", "CommittedTime")
+JOB_REPORT_ATTRS_LOWER = tuple(a.lower() for a in JOB_REPORT_ATTRS)
+
+EXPORT_JOB_ATTRS = ("ClusterId", "ProcId", "JobStatus", "Owner", "QDate", "RemoteUserCpu",
+                    "MemoryUsage", "ImageSize", "CommittedTime")
+EXPORT_JOB_ATTRS_LOWER = tuple(a.lower() for a in EXPORT_JOB_ATTRS)
+EXPORT_FORMATS = frozenset(("summary", "json", "csv"))
+
+# Attributes read by _summarize_jobs
+SUMMARY_JOB_ATTRS = ("JobStatus", "RemoteUserCpu", "MemoryUsage")
+
+@functools.lru_cache(maxsize=1)
+def _default_user_id():
+    """Current system user, looked up once per process."""
+    try:
+        return getpass.getuser()
+    except Exception:
+        return os.getenv('USER', os.getenv('USERNAME', 'unknown'))
+
 def get_session_context(tool_context=None):
     """Extract session context from tool context."""
     if tool_context and isinstance(tool_context, dict):
         return tool_context.get('session_id'), tool_context.get('user_id')
     return None, None
 
+# Seconds a last-active-session lookup is reused; tools that create, switch to or
+# end sessions clear the cache, but other activity can take up to this long to show
+_LAST_SESSION_TTL = 5
+
+@functools.lru_cache(maxsize=16)
+def _cached_last_session(user_id, ttl_bucket):
+    """Look up the last active session; ttl_bucket expires the cached row."""
+    with _session_db_lock:
+        row = _session_db_conn.execute(_LAST_ACTIVE_SESSION_SQL, (user_id,)).fetchone()
+    return row if row else None
+
 def get_last_active_session(user_id=None):
     """Get the last active session for a user."""
     if user_id is None:
-        try:
-            user_id = getpass.getuser()
-        except Exception:
-            user_id = os.getenv('USER', os.getenv('USERNAME', 'unknown'))
+        user_id = _default_user_id()
     
     try:
-        with sqlite3.connect(session_context_manager.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT session_id, created_at, last_activity 
-                FROM sessions 
-                WHERE user_id = ? AND is_active = 1 
-                ORDER BY last_activity DESC 
-                LIMIT 1
-            """, (user_id,))
-            row = cursor.fetchone()
-            return row if row else None
+        return _cached_last_session(user_id, int(time.monotonic() // _LAST_SESSION_TTL))
     except Exception as e:
         logging.error(f"Error getting last active session: {e}")
         return None
@@ -73,28 +264,17 @@ def get_last_active_session(user_id=None):
 def get_all_user_sessions_summary(user_id=None):
     """Get a summary of all sessions for a user."""
     if user_id is None:
-        try:
-            user_id = getpass.getuser()
-        except Exception:
-            user_id = os.getenv('USER', os.getenv('USERNAME', 'unknown'))
+        user_id = _default_user_id()
     
     logging.info(f"Getting sessions for user: {user_id}")
     
     try:
-        with sqlite3.connect(session_context_manager.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT s.session_id, s.created_at, s.last_activity, COUNT(c.conversation_id) as conversation_count
-                FROM sessions s 
-                LEFT JOIN conversations c ON s.session_id = c.session_id 
-                WHERE s.user_id = ? AND s.is_active = TRUE
-                GROUP BY s.session_id 
-                ORDER BY s.last_activity DESC
-            """, (user_id,))
-            rows = cursor.fetchall()
-            logging.info(f"Found {len(rows)} sessions for user {user_id}")
-            result = [dict(zip(['session_id', 'created_at', 'last_activity', 'conversation_count'], row)) for row in rows]
-            logging.info(f"Returning sessions: {result}")
-            return result
+        with _session_db_lock:
+            rows = _session_db_conn.execute(_USER_SESSIONS_SQL, (user_id,)).fetchall()
+        logging.info(f"Found {len(rows)} sessions for user {user_id}")
+        result = [dict(zip(['session_id', 'created_at', 'last_activity', 'conversation_count'], row)) for row in rows]
+        logging.info(f"Returning sessions: {result}")
+        return result
     except Exception as e:
         logging.error(f"Error getting user sessions summary: {e}")
         return []
@@ -105,10 +285,7 @@ def ensure_session_exists(tool_context=None, continue_last_session=True):
     
     if session_id is None:
         # Get current system username
-        try:
-            user_id = getpass.getuser()
-        except Exception:
-            user_id = os.getenv('USER', os.getenv('USERNAME', 'unknown'))
+        user_id = _default_user_id()
         
         if continue_last_session:
             # Try to continue the last active session
@@ -120,27 +297,214 @@ def ensure_session_exists(tool_context=None, continue_last_session=True):
         
         # Create a new session
         session_id = session_context_manager.create_session(user_id, {})
+        _cached_last_session.cache_clear()
         logging.info(f"Created new session {session_id} for user {user_id}")
     
     return session_id, user_id
 
+def _extract_from_fallback(tool_context):
+    """Resolve the session the old way, creating or continuing one as needed."""
+    session_id, user_id = ensure_session_exists(tool_context)
+    return session_id, user_id, None
+
+def _extract_from_adk_context(tool_context):
+    """Read the session from an ADK ToolContext carrying an HTCondorContext."""
+    htcondor_ctx = getattr(tool_context, 'htcondor_context', None) if tool_context else None
+    if htcondor_ctx is None:
+        return _extract_from_fallback(tool_context)
+    return htcondor_ctx.session_id, htcondor_ctx.user_id, htcondor_ctx
+
+@functools.lru_cache(maxsize=32)
+def _session_extractor(context_type):
+    """Pick the session extractor for a tool_context type."""
+    # call_mcp_tool passes plain dicts (or None), which never carry an HTCondorContext
+    if context_type is dict or context_type is type(None):
+        return _extract_from_fallback
+    return _extract_from_adk_context
+
+def _extract_session(tool_context=None):
+    """Return (session_id, user_id, htcondor_ctx) for a tool call."""
+    return _session_extractor(type(tool_context))(tool_context)
+
+_INJECTED_SESSION_PARAMS = ("_sid", "_uid", "_hctx")
+
+def with_htcondor_context(func):
+    """Resolve the tool call's session once and pass it in as _sid and _uid, plus _hctx if declared."""
+    signature = inspect.signature(func)
+    # Hide the injected parameters so FunctionTool doesn't expose them in the tool schema
+    public_signature = signature.replace(parameters=[
+        param for name, param in signature.parameters.items() if name not in _INJECTED_SESSION_PARAMS
+    ])
+    wants_hctx = "_hctx" in signature.parameters
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # FunctionTool passes keyword arguments; only positional calls need binding
+        if args:
+            tool_context = public_signature.bind(*args, **kwargs).arguments.get("tool_context")
+        else:
+            tool_context = kwargs.get("tool_context")
+        sid, uid, hctx = _extract_session(tool_context)
+        if wants_hctx:
+            return func(*args, _sid=sid, _uid=uid, _hctx=hctx, **kwargs)
+        return func(*args, _sid=sid, _uid=uid, **kwargs)
+    
+    wrapper.__signature__ = public_signature
+    return wrapper
+
+# Tool-call log records queued for the background writer; None until the server starts it
+_LOG_QUEUE: Optional[asyncio.Queue] = None
+_LOG_BATCH_SIZE = 64
+_LOG_BATCH_WINDOW = 0.1  # seconds
+_LOG_QUEUE_MAXSIZE = 10000
+
 def log_tool_call(session_id, user_id, tool_name, arguments, result):
     """Log tool call to conversation history."""
     logging.info(f"log_tool_call: session_id={session_id}, user_id={user_id}, tool_name={tool_name}")
-    if session_id and session_context_manager.validate_session(session_id):
+    if _LOG_QUEUE is not None:
+        # The server's writer task persists the record off the request path
         try:
-            tool_call_data = {
-                "tool_name": tool_name,
-                "arguments": arguments,
-                "result": result
-            }
-            session_context_manager.add_message(session_id, "tool_call", str(tool_call_data))
+            _LOG_QUEUE.put_nowait((session_id, user_id, tool_name, arguments, result))
+        except asyncio.QueueFull:
+            logging.warning(f"Tool-call log queue full, dropping record for: {tool_name}")
+        return
+    _write_tool_call(session_id, user_id, tool_name, arguments, result)
+
+def _safe_run(tool_name, session_id, user_id, log_args, func, error_prefix=None):
+    """Run a tool body, turning any exception into a logged failure result."""
+    try:
+        return func()
+    except Exception as e:
+        result = {"success": False, "message": f"{error_prefix or f'Error in {tool_name}'}: {str(e)}"}
+        log_tool_call(session_id, user_id, tool_name, log_args, result)
+        return result
+
+def _log_dumps(obj) -> str:
+    """Serialize a logged value to JSON, stringifying anything JSON can't represent."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=str, option=_ORJSON_OPTS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, default=str)
+
+def _tool_call_content(tool_name, arguments, result) -> str:
+    """Format a tool call as stored in the conversations table."""
+    return _log_dumps({"tool_name": tool_name, "arguments": arguments, "result": result})
+
+# Set once the first tool call stored in the legacy Python-repr format is read
+_legacy_tool_call_warned = False
+
+def _parse_tool_call(content):
+    """Decode a tool call stored in the conversations table."""
+    global _legacy_tool_call_warned
+    if not isinstance(content, str):
+        return content
+    if content.startswith('{"'):
+        return orjson.loads(content) if orjson is not None else json.loads(content)
+    # Rows logged before tool calls were stored as JSON hold str(dict)
+    if not _legacy_tool_call_warned:
+        _legacy_tool_call_warned = True
+        logging.warning("Reading tool calls stored in the legacy repr format; new entries are stored as JSON")
+    return ast.literal_eval(content)
+
+# Sessions recently confirmed valid for logging, mapped to when that check expires
+_validated_sessions: dict[str, float] = {}
+_validated_sessions_lock = threading.Lock()
+_VALIDATED_SESSION_TTL = 30  # seconds
+_VALIDATED_SESSIONS_MAX = 1024
+
+def _session_is_valid(session_id) -> bool:
+    """Validate a session for logging, hitting the database at most once per TTL window."""
+    now = time.monotonic()
+    with _validated_sessions_lock:
+        expires = _validated_sessions.get(session_id)
+        if expires is not None:
+            if expires > now:
+                return True
+            del _validated_sessions[session_id]
+    if not session_context_manager.validate_session(session_id):
+        return False
+    with _validated_sessions_lock:
+        _validated_sessions.pop(session_id, None)
+        _validated_sessions[session_id] = now + _VALIDATED_SESSION_TTL
+        # Every entry gets the same TTL, so insertion order is expiry order and expired
+        # entries (or the oldest, past the size cap) are always at the front
+        while True:
+            oldest = next(iter(_validated_sessions))
+            if _validated_sessions[oldest] > now and len(_validated_sessions) <= _VALIDATED_SESSIONS_MAX:
+                break
+            del _validated_sessions[oldest]
+    return True
+
+def _write_tool_call(session_id, user_id, tool_name, arguments, result):
+    """Persist a single tool call to the conversations table."""
+    if session_id and _session_is_valid(session_id):
+        try:
+            session_context_manager.add_message(session_id, "tool_call",
+                                                _tool_call_content(tool_name, arguments, result),
+                                                validate=False)
             logging.info(f"Successfully logged tool call for session {session_id}")
         except Exception as e:
             logging.error(f"Failed to log tool call: {e}")
     else:
         logging.warning(f"No valid session_id for tool call: {tool_name}")
 
+def _write_tool_calls(batch):
+    """Persist a batch of queued tool-call records in a single transaction."""
+    messages = []
+    for session_id, user_id, tool_name, arguments, result in batch:
+        if not session_id or not _session_is_valid(session_id):
+            logging.warning(f"No valid session_id for tool call: {tool_name}")
+            continue
+        messages.append((session_id, "tool_call", _tool_call_content(tool_name, arguments, result)))
+    if not messages:
+        return
+    try:
+        stored = session_context_manager.add_messages(messages, validate=False)
+        logging.info(f"Logged {stored} of {len(messages)} tool calls")
+    except Exception as e:
+        logging.error(f"Failed to log tool calls: {e}")
+
+async def _log_writer_task(queue: asyncio.Queue):
+    """Drain queued tool-call records in batches of up to _LOG_BATCH_SIZE or _LOG_BATCH_WINDOW seconds."""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + _LOG_BATCH_WINDOW
+        try:
+            while len(batch) < _LOG_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # Shutting down mid-batch: don't drop what was already dequeued
+            _write_tool_calls(batch)
+            raise
+        # SQLite writes block, so keep them off the event loop
+        await asyncio.to_thread(_write_tool_calls, batch)
+
+def _ad_value(ad, attr):
+    """Read a job ad attribute, evaluating an ExprTree to a primitive (avoids JSON errors)."""
+    v = ad.get(attr)
+    if hasattr(v, "eval"):
+        try:
+            v = v.eval()
+        except Exception:
+            v = None
+    return v
+
+def _serialize_list_job(ad) -> dict:
+    """Build the list_jobs record for one job ad."""
+    result = {a: _ad_value(ad, a) for a in LIST_JOB_ATTRS}
+    # Add human-readable status
+    result["Status"] = JOB_STATUS_NAMES.get(result["JobStatus"], "Unknown")
+    return result
+
 def list_jobs(owner: Optional[str] = None, status: Optional[str] = None, limit: int = 10, tool_context=None) -> dict:
     # Get simplified session context manager
     scm = get_simplified_session_context_manager()
@@ -148,9 +512,9 @@ def list_jobs(owner: Optional[str] = None, status: Optional[str] = None, limit:
     # Extract session info from tool_context if available
     session_id = None
     user_id = None
-    if tool_context and hasattr(tool_context, 'htcondor_context'):
+    htcondor_ctx = getattr(tool_context, 'htcondor_context', None) if tool_context else None
+    if htcondor_ctx is not None:
         # Using proper ADK ToolContext
-        htcondor_ctx = tool_context.htcondor_context
         session_id = htcondor_ctx.session_id
         user_id = htcondor_ctx.user_id
         
@@ -174,53 +538,18 @@ def list_jobs(owner: Optional[str] = None, status: Optional[str] = None, limit:
     if owner is not None:
         constraints.append(f'Owner == "{owner}"')
     if status is not None:
-        status_map = {
-            "running": 2, "idle": 1, "held": 5,
-            "completed": 4, "removed": 3,
-            "transferring_output": 6, "suspended": 7,
-        }
-        code = status_map.get(status.lower())
+        code = STATUS_MAP.get(status.lower())
         if code is not None:
             constraints.append(f"JobStatus == {code}")
     constraint = " and ".join(constraints) if constraints else "True"
 
-    # Only request JSON-safe fields
-    attrs = ["ClusterId", "ProcId", "JobStatus", "Owner"]
-    ads = schedd.query(constraint, projection=attrs)
+    ads = schedd.query(constraint, projection=list(LIST_JOB_ATTRS))
     total_jobs = len(ads)
     
     # Only return first 10 jobs to prevent token limit errors
-    ads = ads[:limit]
-
-    status_code_map = {
-        1: "Idle",
-        2: "Running",
-        3: "Removed",
-        4: "Completed",
-        5: "Held",
-        6: "Transferring Output",
-        7: "Suspended"
-    }
-
-    def serialize_ad(ad):
-        result = {}
-        for a in attrs:
-            v = ad.get(a)
-            # Evaluate ExprTree to primitive (avoids JSON errors)
-            if hasattr(v, "eval"):
-                try:
-                    v = v.eval()
-                except Exception:
-                    v = None
-            result[a] = v
-        # Add human-readable status
-        status_num = result.get("JobStatus")
-        result["Status"] = status_code_map.get(status_num, "Unknown")
-        return result
-
     result = {
         "success": True, 
-        "jobs": [serialize_ad(ad) for ad in ads],
+        "jobs": [_serialize_list_job(ad) for ad in ads[:limit]],
         "total_jobs": total_jobs
     }
     
@@ -237,22 +566,23 @@ def get_job_status(cluster_id: int, tool_context=None) -> dict:
     # Extract session info from tool_context if available
     session_id = None
     user_id = None
-    if tool_context and hasattr(tool_context, 'htcondor_context'):
+    htcondor_ctx = getattr(tool_context, 'htcondor_context', None) if tool_context else None
+    if htcondor_ctx is not None:
         # Using proper ADK ToolContext
-        htcondor_ctx = tool_context.htcondor_context
         session_id = htcondor_ctx.session_id
         user_id = htcondor_ctx.user_id
         
         # Update job context with this cluster_id
-        if hasattr(tool_context, 'update_job_context'):
-            tool_context.update_job_context(cluster_id)
+        update_job_context = getattr(tool_context, 'update_job_context', None)
+        if update_job_context is not None:
+            update_job_context(cluster_id)
     else:
         # Fallback to old method
         session_id, user_id = ensure_session_exists(tool_context)
     
     try:
         schedd = htcondor.Schedd()
-        ads = schedd.query(f"ClusterId == {cluster_id}")
+        ads = schedd.query(f"ClusterId == {cluster_id}", projection=list(JOB_STATUS_FIELDS), limit=1)
         if not ads:
             result = {"success": False, "message": "Job not found"}
             log_tool_call(session_id, user_id, "get_job_status", {"cluster_id": cluster_id}, result)
@@ -262,92 +592,13 @@ def get_job_status(cluster_id: int, tool_context=None) -> dict:
         job_info = {}
         
         # Extract only the most useful information from the raw HTCondor output
-        useful_fields = {
-            "ClusterId": "Cluster ID",
-            "ProcId": "Process ID",
-            "JobStatus": "Job Status",
-            "Owner": "Owner",
-            "Cmd": "Command",
-            "Arguments": "Arguments",
-            "Iwd": "Working Directory",
-            "JobUniverse": "Job Universe",
-            "QDate": "Queue Date",
-            "JobStartDate": "Job Start Date",
-            "JobCurrentStartDate": "Current Start Date",
-            "RemoteHost": "Execution Host",
-            "RemoteUserCpu": "CPU Time Used",
-            "RemoteSysCpu": "System CPU Time",
-            "MemoryUsage": "Memory Used",
-            "DiskUsage": "Disk Used",
-            "RequestCpus": "Requested CPUs",
-            "RequestMemory": "Requested Memory",
-            "RequestDisk": "Requested Disk",
-            "JobPrio": "Job Priority",
-            "NumJobStarts": "Number of Starts",
-            "JobRunCount": "Run Count",
-            "ExitStatus": "Exit Status",
-            "WallClockCheckpoint": "Wall Clock Time",
-            "In": "Input File",
-            "Out": "Output File",
-            "Err": "Error File",
-            "UserLog": "Log File"
-        }
         
-        for field_name, display_name in useful_fields.items():
-            v = ad.get(field_name)
-            if hasattr(v, "eval"):
-                try:
-                    v = v.eval()
-                except Exception:
-                    v = None
+        for field_name, display_name in JOB_STATUS_FIELDS.items():
+            v = _ad_value(ad, field_name)
             if v is not None:
                 # Format special fields
-                if field_name == "JobStatus":
-                    status_map = {
-                        1: "Idle", 2: "Running", 3: "Removed", 4: "Completed",
-                        5: "Held", 6: "Transferring Output", 7: "Suspended"
-                    }
-                    v = f"{v} ({status_map.get(v, 'Unknown')})"
-                elif field_name == "JobUniverse":
-                    universe_map = {
-                        1: "Standard", 2: "Pipes", 3: "Linda", 4: "PVM",
-                        5: "Vanilla", 6: "Scheduler", 7: "MPI", 9: "Grid",
-                        10: "Java", 11: "Parallel", 12: "Local", 13: "Docker"
-                    }
-                    v = f"{v} ({universe_map.get(v, 'Unknown')})"
-                elif field_name in ["QDate", "JobStartDate", "JobCurrentStartDate"] and v:
-                    # Convert Unix timestamp to readable format
-                    try:
-                        v = datetime.datetime.fromtimestamp(v).isoformat()
-                    except (ValueError, TypeError):
-                        pass
-                elif field_name in ["RequestMemory", "MemoryUsage"] and v:
-                    # Format memory with units
-                    if v >= 1024:
-                        v = f"{v} MB ({v//1024} GB)"
-                    else:
-                        v = f"{v} MB"
-                elif field_name in ["RequestDisk", "DiskUsage"] and v:
-                    # Format disk with units
-                    if v >= 1024:
-                        v = f"{v} MB ({v//1024} GB)"
-                    else:
-                        v = f"{v} MB"
-                elif field_name == "Arguments" and not v:
-                    v = "(none)"
-                elif field_name in ["In", "Out", "Err"] and not v:
-                    v = "(default)"
-                elif field_name == "WallClockCheckpoint" and v:
-                    # Convert seconds to hours:minutes:seconds
-                    try:
-                        hours = int(v // 3600)
-                        minutes = int((v % 3600) // 60)
-                        seconds = int(v % 60)
-                        v = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-                    except (ValueError, TypeError):
-                        pass
-                
-                job_info[display_name] = v
+                formatter = JOB_STATUS_FORMATTERS.get(field_name)
+                job_info[display_name] = formatter(v) if formatter else v
         
         result = {
             "success": True,
@@ -386,21 +637,15 @@ def get_job_history(cluster_id: int, limit: int = 50, tool_context=None) -> dict
     
     try:
         schedd = htcondor.Schedd()
-        ads = schedd.query(f"ClusterId == {cluster_id}")
+        ads = schedd.query(f"ClusterId == {cluster_id}", projection=list(JOB_HISTORY_ATTRS), limit=1)
         if not ads:
             result = {"success": False, "message": "Job not found"}
             log_tool_call(session_id, user_id, "get_job_history", {"cluster_id": cluster_id, "limit": limit}, result)
             return result
         
+        # Only the attributes the events are built from need evaluating
         ad = ads[0]
-        job_info = {}
-        for k, v in ad.items():
-            if hasattr(v, "eval"):
-                try:
-                    v = v.eval()
-                except Exception:
-                    v = None
-            job_info[k] = v
+        job_info = {attr: _ad_value(ad, attr) for attr in JOB_HISTORY_ATTRS}
         
         # Get actual job timestamps and create realistic history
         q_date = job_info.get("QDate")  # Queue date (submission time)
@@ -475,6 +720,7 @@ def create_session(user_id: str, metadata: Optional[dict] = None, tool_context=N
     
     try:
         session_id = scm.create_session(user_id, metadata)
+        _cached_last_session.cache_clear()
         result = {
             "success": True,
             "session_id": session_id,
@@ -495,16 +741,14 @@ def create_session(user_id: str, metadata: Optional[dict] = None, tool_context=N
 def start_fresh_session(user_id: Optional[str] = None, metadata: Optional[dict] = None, tool_context=None) -> dict:
     """Start a completely fresh session, ignoring any existing sessions."""
     if user_id is None:
-        try:
-            user_id = getpass.getuser()
-        except Exception:
-            user_id = os.getenv('USER', os.getenv('USERNAME', 'unknown'))
+        user_id = _default_user_id()
     
     # Get simplified session context manager
     scm = get_simplified_session_context_manager()
     
     try:
         session_id = scm.create_session(user_id, metadata or {})
+        _cached_last_session.cache_clear()
         result = {
             "success": True,
             "session_id": session_id,
@@ -563,6 +807,9 @@ def end_session(session_id: str, tool_context=None) -> dict:
     try:
         if scm.validate_session(session_id):
             scm.deactivate_session(session_id)
+            _cached_last_session.cache_clear()
+            with _validated_sessions_lock:
+                _validated_sessions.pop(session_id, None)
             result = {
                 "success": True,
                 "message": "Session ended successfully"
@@ -583,6 +830,20 @@ def end_session(session_id: str, tool_context=None) -> dict:
         log_tool_call(session_id, user_id, "end_session", {"session_id": session_id}, result)
         return result
 
+def _summarize_tool_call(timestamp, tool_data) -> dict:
+    """Build the history record for one parsed tool call."""
+    result_str = str(tool_data.get('result', {}))
+    return {
+        "timestamp": timestamp,
+        "tool_name": tool_data.get('tool_name', 'Unknown'),
+        "arguments": tool_data.get('arguments', {}),
+        "result_summary": result_str[:200] + "..." if len(result_str) > 200 else result_str
+    }
+
+def _format_history_entry(entry) -> dict:
+    """Summarize one stored tool call for get_session_history."""
+    return _summarize_tool_call(entry['timestamp'], _parse_tool_call(entry['content']))
+
 def get_session_history(session_id: str, tool_context=None) -> dict:
     """Get conversation history for a specific session."""
     # Get simplified session context manager
@@ -597,10 +858,7 @@ def get_session_history(session_id: str, tool_context=None) -> dict:
     
     # If still no user_id, try to get current system user
     if user_id == 'unknown':
-        try:
-            user_id = getpass.getuser()
-        except Exception:
-            user_id = os.getenv('USER', os.getenv('USERNAME', 'unknown'))
+        user_id = _default_user_id()
     
     try:
         if not scm.validate_session(session_id):
@@ -618,26 +876,7 @@ def get_session_history(session_id: str, tool_context=None) -> dict:
         formatted_history = []
         for entry in history:
             try:
-                # Parse the tool call data - use ast.literal_eval for safer parsing
-                import ast
-                content_str = entry['content']
-                if isinstance(content_str, str):
-                    # Try to parse as literal eval first (safer)
-                    try:
-                        tool_data = ast.literal_eval(content_str)
-                    except (ValueError, SyntaxError):
-                        # Fallback to eval if literal_eval fails
-                        tool_data = eval(content_str)
-                else:
-                    tool_data = content_str
-                
-                formatted_entry = {
-                    "timestamp": entry['timestamp'],
-                    "tool_name": tool_data.get('tool_name', 'Unknown'),
-                    "arguments": tool_data.get('arguments', {}),
-                    "result_summary": str(tool_data.get('result', {}))[:200] + "..." if len(str(tool_data.get('result', {}))) > 200 else str(tool_data.get('result', {}))
-                }
-                formatted_history.append(formatted_entry)
+                formatted_history.append(_format_history_entry(entry))
             except Exception as e:
                 # Skip malformed entries but log the error
                 logging.warning(f"Failed to parse conversation entry: {e}")
@@ -665,10 +904,7 @@ def get_session_history(session_id: str, tool_context=None) -> dict:
 def list_user_sessions(user_id: Optional[str] = None, tool_context=None) -> dict:
     """List all sessions for the current user."""
     if user_id is None:
-        try:
-            user_id = getpass.getuser()
-        except Exception:
-            user_id = os.getenv('USER', os.getenv('USERNAME', 'unknown'))
+        user_id = _default_user_id()
     
     logging.info(f"list_user_sessions called with user_id: {user_id}")
     
@@ -681,6 +917,8 @@ def list_user_sessions(user_id: Optional[str] = None, tool_context=None) -> dict
             "success": True,
             "user_id": user_id,
             "total_sessions": len(sessions),
+            # Sessions are ordered by last activity, so the first is the one continue_last_session picks
+            "last_active_session_id": sessions[0]["session_id"] if sessions else None,
             "sessions": sessions
         }
         
@@ -703,10 +941,7 @@ def continue_last_session(user_id: Optional[str] = None, tool_context=None) -> d
     scm = get_simplified_session_context_manager()
     
     if user_id is None:
-        try:
-            user_id = getpass.getuser()
-        except Exception:
-            user_id = os.getenv('USER', os.getenv('USERNAME', 'unknown'))
+        user_id = _default_user_id()
     
     try:
         last_session = get_last_active_session(user_id)
@@ -741,10 +976,7 @@ def continue_last_session(user_id: Optional[str] = None, tool_context=None) -> d
 def continue_specific_session(session_id: str, user_id: Optional[str] = None, tool_context=None) -> dict:
     """Continue a specific session by session ID."""
     if user_id is None:
-        try:
-            user_id = getpass.getuser()
-        except Exception:
-            user_id = os.getenv('USER', os.getenv('USERNAME', 'unknown'))
+        user_id = _default_user_id()
     
     logging.info(f"continue_specific_session called with session_id: {session_id}, user_id: {user_id}")
     
@@ -752,20 +984,16 @@ def continue_specific_session(session_id: str, user_id: Optional[str] = None, to
         # Get simplified session context manager
         scm = get_simplified_session_context_manager()
         
-        # Validate the session
-        if not scm.validate_session(session_id):
+        # Validate the session and update its activity, which makes it the last active session
+        session_context = scm.touch_and_get_session(session_id)
+        if session_context is None:
             result = {
                 "success": False,
                 "message": "Invalid or expired session"
             }
             log_tool_call(session_id, user_id, "continue_specific_session", {"session_id": session_id, "user_id": user_id}, result)
             return result
-        
-        # Get session context
-        session_context = scm.get_session_context(session_id)
-        
-        # Update session activity
-        scm.update_session_activity(session_id)
+        _cached_last_session.cache_clear()
         
         result = {
             "success": True,
@@ -789,10 +1017,7 @@ def continue_specific_session(session_id: str, user_id: Optional[str] = None, to
 def get_user_conversation_memory(user_id: Optional[str] = None, limit: int = 50, tool_context=None) -> dict:
     """Get conversation memory across all sessions for a user."""
     if user_id is None:
-        try:
-            user_id = getpass.getuser()
-        except Exception:
-            user_id = os.getenv('USER', os.getenv('USERNAME', 'unknown'))
+        user_id = _default_user_id()
     
     try:
         # Get all sessions for the user
@@ -801,63 +1026,38 @@ def get_user_conversation_memory(user_id: Optional[str] = None, limit: int = 50,
         # Get simplified session context manager
         scm = get_simplified_session_context_manager()
         
-        # Get conversation history from all sessions
+        # Get conversation history from all sessions; only the entries returned
+        # below get a full record with a result summary
         all_conversations = []
-        for session in sessions:
-            session_id = session['session_id']
-            history = scm.get_conversation_history(session_id, limit=limit)
-            
+        histories = scm.get_conversation_history_bulk([session['session_id'] for session in sessions], limit=limit)
+        for session_id, history in histories.items():
             for entry in history:
                 try:
-                    # Parse the tool call data - use ast.literal_eval for safer parsing
-                    import ast
-                    content_str = entry['content']
-                    if isinstance(content_str, str):
-                        # Try to parse as literal eval first (safer)
-                        try:
-                            tool_data = ast.literal_eval(content_str)
-                        except (ValueError, SyntaxError):
-                            # Fallback to eval if literal_eval fails
-                            tool_data = eval(content_str)
-                    else:
-                        tool_data = content_str
-                    
-                    conversation_entry = {
-                        "session_id": session_id,
-                        "timestamp": entry['timestamp'],
-                        "tool_name": tool_data.get('tool_name', 'Unknown'),
-                        "arguments": tool_data.get('arguments', {}),
-                        "result_summary": str(tool_data.get('result', {}))[:200] + "..." if len(str(tool_data.get('result', {}))) > 200 else str(tool_data.get('result', {}))
-                    }
-                    all_conversations.append(conversation_entry)
+                    tool_data = _parse_tool_call(entry['content'])
+                    all_conversations.append((entry['timestamp'], session_id, tool_data.get('tool_name', 'Unknown'),
+                                              tool_data.get('arguments', {}), tool_data))
                 except Exception as e:
                     # Skip malformed entries but log the error
                     logging.warning(f"Failed to parse conversation entry in memory: {e}")
                     continue
         
         # Sort by timestamp
-        all_conversations.sort(key=lambda x: x['timestamp'])
+        all_conversations.sort(key=itemgetter(0))
         
         # Extract key information
-        job_references = set()
-        tool_usage = {}
-        
-        for conv in all_conversations:
-            # Count tool usage
-            tool_name = conv['tool_name']
-            tool_usage[tool_name] = tool_usage.get(tool_name, 0) + 1
-            
-            # Extract job references
-            args = conv['arguments']
-            if 'cluster_id' in args:
-                job_references.add(args['cluster_id'])
+        tool_usage = Counter(conv[2] for conv in all_conversations)
+        job_references = {conv[3]['cluster_id'] for conv in all_conversations if 'cluster_id' in conv[3]}
+        recent_conversations = [
+            {"session_id": session_id, **_summarize_tool_call(timestamp, tool_data)}
+            for timestamp, session_id, _, _, tool_data in all_conversations[-limit:]
+        ]
         
         result = {
             "success": True,
             "user_id": user_id,
             "total_sessions": len(sessions),
             "total_conversations": len(all_conversations),
-            "recent_conversations": all_conversations[-limit:],  # Most recent conversations
+            "recent_conversations": recent_conversations,  # Most recent conversations
             "job_references": list(job_references),
             "tool_usage_summary": tool_usage,
             "sessions_summary": sessions
@@ -888,10 +1088,7 @@ def get_session_summary(session_id: str, tool_context=None) -> dict:
     
     # If still no user_id, try to get current system user
     if user_id == 'unknown':
-        try:
-            user_id = getpass.getuser()
-        except Exception:
-            user_id = os.getenv('USER', os.getenv('USERNAME', 'unknown'))
+        user_id = _default_user_id()
     
     try:
         if not scm.validate_session(session_id):
@@ -906,34 +1103,13 @@ def get_session_summary(session_id: str, tool_context=None) -> dict:
         history = scm.get_conversation_history(session_id)
         
         # Analyze the history
-        tool_counts = {}
-        job_references = set()
+        parsed = []
         last_activity = None
         
         for entry in history:
             try:
-                # Parse the tool call data - use ast.literal_eval for safer parsing
-                import ast
-                content_str = entry['content']
-                if isinstance(content_str, str):
-                    # Try to parse as literal eval first (safer)
-                    try:
-                        tool_data = ast.literal_eval(content_str)
-                    except (ValueError, SyntaxError):
-                        # Fallback to eval if literal_eval fails
-                        tool_data = eval(content_str)
-                else:
-                    tool_data = content_str
-                
-                tool_name = tool_data.get('tool_name', 'Unknown')
-                
-                # Count tool usage
-                tool_counts[tool_name] = tool_counts.get(tool_name, 0) + 1
-                
-                # Extract job references
-                args = tool_data.get('arguments', {})
-                if 'cluster_id' in args:
-                    job_references.add(args['cluster_id'])
+                tool_data = _parse_tool_call(entry['content'])
+                parsed.append((tool_data.get('tool_name', 'Unknown'), tool_data.get('arguments', {})))
                 
                 # Track last activity
                 if not last_activity or entry['timestamp'] > last_activity:
@@ -944,6 +1120,9 @@ def get_session_summary(session_id: str, tool_context=None) -> dict:
                 logging.warning(f"Failed to parse conversation entry in summary: {e}")
                 continue
         
+        tool_counts = Counter(tool_name for tool_name, _ in parsed)
+        job_references = {args['cluster_id'] for _, args in parsed if 'cluster_id' in args}
+        
         # Create summary
         summary = {
             "session_id": session_id,
@@ -973,36 +1152,54 @@ def get_session_summary(session_id: str, tool_context=None) -> dict:
 
 # ===== CLUSTER AND POOL INFORMATION =====
 
+@functools.lru_cache(maxsize=1)
+def _pool_info_static() -> tuple:
+    """Read the pool list from the HTCondor configuration (cached until reload)."""
+    # Get pool information from HTCondor configuration
+    config = htcondor.param
+    pool_info = []
+    
+    # Get current pool
+    current_pool = config.get("COLLECTOR_HOST", "Unknown")
+    pool_info.append({
+        "name": "Default Pool",
+        "collector_host": current_pool,
+        "status": "Active",
+        "description": "Primary HTCondor pool"
+    })
+    
+    # Try to get additional pools from configuration
+    try:
+        # Look for additional collectors
+        additional_collectors = config.get("SECONDARY_COLLECTOR_HOSTS", "")
+        if additional_collectors:
+            for i, collector in enumerate(additional_collectors.split(',')):
+                pool_info.append({
+                    "name": f"Secondary Pool {i+1}",
+                    "collector_host": collector.strip(),
+                    "status": "Active",
+                    "description": "Secondary HTCondor pool"
+                })
+    except Exception:
+        pass
+    
+    return tuple(pool_info)
+
+
+def reload_pool_config(*_):
+    """Re-read the HTCondor configuration and drop the cached pool list."""
+    try:
+        htcondor.reload_config()
+    except Exception as e:
+        logging.error(f"Failed to reload HTCondor configuration: {e}")
+    _pool_info_static.cache_clear()
+    logging.info("Pool configuration cache cleared")
+
+
 def list_pools(tool_context=None) -> dict:
     """List available HTCondor pools."""
     try:
-        # Get pool information from HTCondor configuration
-        config = htcondor.param
-        pool_info = []
-        
-        # Get current pool
-        current_pool = config.get("COLLECTOR_HOST", "Unknown")
-        pool_info.append({
-            "name": "Default Pool",
-            "collector_host": current_pool,
-            "status": "Active",
-            "description": "Primary HTCondor pool"
-        })
-        
-        # Try to get additional pools from configuration
-        try:
-            # Look for additional collectors
-            additional_collectors = config.get("SECONDARY_COLLECTOR_HOSTS", "")
-            if additional_collectors:
-                for i, collector in enumerate(additional_collectors.split(',')):
-                    pool_info.append({
-                        "name": f"Secondary Pool {i+1}",
-                        "collector_host": collector.strip(),
-                        "status": "Active",
-                        "description": "Secondary HTCondor pool"
-                    })
-        except Exception:
-            pass
+        pool_info = [dict(pool) for pool in _pool_info_static()]
         
         return {
             "success": True,
@@ -1022,27 +1219,8 @@ def get_pool_status(tool_context=None) -> dict:
         all_jobs = schedd.query("True", projection=["JobStatus", "Owner"])
         
         # Count jobs by status
-        status_counts = defaultdict(int)
-        user_counts = defaultdict(int)
-        
-        for ad in all_jobs:
-            status = ad.get("JobStatus")
-            owner = ad.get("Owner")
-            
-            if hasattr(status, "eval"):
-                try:
-                    status = status.eval()
-                except Exception:
-                    status = None
-            
-            if hasattr(owner, "eval"):
-                try:
-                    owner = owner.eval()
-                except Exception:
-                    owner = None
-            
-            status_counts[status] += 1
-            user_counts[owner] += 1
+        status_counts = Counter(_ad_value(ad, "JobStatus") for ad in all_jobs)
+        user_counts = Counter(_ad_value(ad, "Owner") for ad in all_jobs)
         
         # Get machine information
         collector = htcondor.Collector()
@@ -1089,30 +1267,15 @@ def list_machines(status: Optional[str] = None, tool_context=None) -> dict:
         collector = htcondor.Collector()
         
         # Build constraint based on status
-        constraint = "True"
-        if status:
-            if status.lower() == "available":
-                constraint = "State == 'Unclaimed'"
-            elif status.lower() == "busy":
-                constraint = "State == 'Claimed'"
-            elif status.lower() == "offline":
-                constraint = "State == 'Owner'"
+        constraint = MACHINE_STATE_CONSTRAINTS.get(status.lower(), "True") if status else "True"
         
         machines = collector.query(htcondor.AdTypes.Startd, constraint, 
-                                 projection=["Name", "State", "Activity", "LoadAvg", "Memory", "Cpus"])
+                                 projection=list(MACHINE_ATTRS))
         
-        machine_list = []
-        for machine in machines:
-            machine_info = {}
-            for attr in ["Name", "State", "Activity", "LoadAvg", "Memory", "Cpus"]:
-                v = machine.get(attr)
-                if hasattr(v, "eval"):
-                    try:
-                        v = v.eval()
-                    except Exception:
-                        v = None
-                machine_info[attr.lower()] = v
-            machine_list.append(machine_info)
+        machine_list = [
+            {key: _ad_value(machine, attr) for attr, key in zip(MACHINE_ATTRS, MACHINE_ATTRS_LOWER)}
+            for machine in machines
+        ]
         
         return {
             "success": True,
@@ -1163,25 +1326,13 @@ def get_resource_usage(cluster_id: Optional[int] = None, tool_context=None) -> d
         if cluster_id:
             # Get resource usage for specific job
             schedd = htcondor.Schedd()
-            ads = schedd.query(f"ClusterId == {cluster_id}")
+            ads = schedd.query(f"ClusterId == {cluster_id}", projection=list(JOB_RESOURCE_ATTRS), limit=1)
             if not ads:
                 return {"success": False, "message": "Job not found"}
             
-            ad = ads[0]
-            usage = {}
-            
             # Extract resource usage fields
-            resource_fields = ["RemoteUserCpu", "RemoteSysCpu", "ImageSize", 
-                             "MemoryUsage", "DiskUsage", "CommittedTime"]
-            
-            for field in resource_fields:
-                v = ad.get(field)
-                if hasattr(v, "eval"):
-                    try:
-                        v = v.eval()
-                    except Exception:
-                        v = None
-                usage[field] = v
+            ad = ads[0]
+            usage = {field: _ad_value(ad, field) for field in JOB_RESOURCE_ATTRS}
             
             return {
                 "success": True,
@@ -1245,31 +1396,12 @@ def get_queue_stats(tool_context=None) -> dict:
         schedd = htcondor.Schedd()
         all_jobs = schedd.query("True", projection=["JobStatus"])
         
-        status_counts = defaultdict(int)
-        for ad in all_jobs:
-            status = ad.get("JobStatus")
-            if hasattr(status, "eval"):
-                try:
-                    status = status.eval()
-                except Exception:
-                    status = None
-            
-            status_counts[status] += 1
+        status_counts = Counter(_ad_value(ad, "JobStatus") for ad in all_jobs)
         
         # Convert status codes to readable names
-        status_names = {
-            1: "Idle",
-            2: "Running", 
-            3: "Removed",
-            4: "Completed",
-            5: "Held",
-            6: "Transferring Output",
-            7: "Suspended"
-        }
-        
         readable_stats = {}
         for status_code, count in status_counts.items():
-            status_name = status_names.get(status_code, f"Status_{status_code}")
+            status_name = JOB_STATUS_NAMES.get(status_code) or f"Status_{status_code}"
             readable_stats[status_name] = count
         
         return {
@@ -1351,83 +1483,82 @@ def get_system_load(tool_context=None) -> dict:
 
 # ===== REPORTING AND ANALYTICS =====
 
+# Number of jobs listed individually in a job report
+JOB_REPORT_DETAIL_LIMIT = 100
+
+# Units accepted in time_range arguments; anything else falls back to 24 hours
+_TIME_RANGE_UNITS = types.MappingProxyType({
+    'h': datetime.timedelta(hours=1),
+    'd': datetime.timedelta(days=1),
+})
+
+@functools.lru_cache(maxsize=32)
+def _time_range_delta(time_range: str) -> datetime.timedelta:
+    """Parse a time range such as "24h" or "7d" into a timedelta."""
+    unit = _TIME_RANGE_UNITS.get(time_range[-1:])
+    if unit is None:
+        return datetime.timedelta(hours=24)
+    return int(time_range[:-1]) * unit
+
+def _summarize_jobs(ads):
+    """Total RemoteUserCpu and MemoryUsage and count JobStatus codes over job ads."""
+    total_cpu = 0
+    total_memory = 0
+    status_counts = Counter()
+    for ad in ads:
+        total_cpu += _ad_value(ad, "RemoteUserCpu") or 0
+        total_memory += _ad_value(ad, "MemoryUsage") or 0
+        status_counts[_ad_value(ad, "JobStatus")] += 1
+    return total_cpu, total_memory, status_counts
+
 def generate_job_report(owner: Optional[str] = None, time_range: Optional[str] = None, tool_context=None) -> dict:
     """Generate comprehensive job report."""
     session_id, user_id = ensure_session_exists(tool_context)
     
     try:
         schedd = htcondor.Schedd()
+        now = datetime.datetime.now()
         
         # Build constraint
         constraints = []
         if owner:
             constraints.append(f'Owner == "{owner}"')
         if time_range:
-            # Parse time range (e.g., "24h", "7d", "30d")
-            if time_range.endswith('h'):
-                hours = int(time_range[:-1])
-                cutoff_time = datetime.datetime.now() - datetime.timedelta(hours=hours)
-            elif time_range.endswith('d'):
-                days = int(time_range[:-1])
-                cutoff_time = datetime.datetime.now() - datetime.timedelta(days=days)
-            else:
-                cutoff_time = datetime.datetime.now() - datetime.timedelta(hours=24)
-            
+            cutoff_time = now - _time_range_delta(time_range)
             constraints.append(f'QDate > {int(cutoff_time.timestamp())}')
         
         constraint = " and ".join(constraints) if constraints else "True"
         
         # Get jobs with extended attributes
-        attrs = ["ClusterId", "ProcId", "JobStatus", "Owner", "QDate", "RemoteUserCpu", 
-                "RemoteSysCpu", "ImageSize", "MemoryUsage", "CommittedTime"]
-        jobs = schedd.query(constraint, projection=attrs)
+        jobs = schedd.query(constraint, projection=list(JOB_REPORT_ATTRS))
         
-        # Process job data
-        job_data = []
-        total_cpu = 0
-        total_memory = 0
-        status_counts = defaultdict(int)
+        # Calculate resource usage; the summary only needs three attributes per job
+        total_jobs = len(jobs)
+        total_cpu, total_memory, status_counts = _summarize_jobs(jobs)
         
-        for ad in jobs:
-            job_info = {}
-            for attr in attrs:
-                v = ad.get(attr)
-                if hasattr(v, "eval"):
-                    try:
-                        v = v.eval()
-                    except Exception:
-                        v = None
-                job_info[attr.lower()] = v
-            
-            # Calculate resource usage
-            cpu_time = job_info.get("remoteusercpu", 0) or 0
-            memory_usage = job_info.get("memoryusage", 0) or 0
-            
-            total_cpu += cpu_time
-            total_memory += memory_usage
-            
-            status = job_info.get("jobstatus")
-            status_counts[status] += 1
-            
-            job_data.append(job_info)
+        # Limit to first 100 jobs to prevent large responses
+        job_data = [
+            {key: _ad_value(ad, attr) for attr, key in zip(JOB_REPORT_ATTRS, JOB_REPORT_ATTRS_LOWER)}
+            for ad in jobs[:JOB_REPORT_DETAIL_LIMIT]
+        ]
         
         # Generate report
         report = {
             "report_metadata": {
-                "generated_at": datetime.datetime.now().isoformat(),
+                "generated_at": now.isoformat(),
                 "owner_filter": owner or "all",
                 "time_range": time_range or "all",
-                "total_jobs": len(job_data)
+                "total_jobs": total_jobs
             },
             "summary": {
-                "total_jobs": len(job_data),
+                "total_jobs": total_jobs,
                 "status_distribution": dict(status_counts),
                 "total_cpu_time": total_cpu,
                 "total_memory_usage": total_memory,
-                "average_cpu_per_job": total_cpu / len(job_data) if job_data else 0,
-                "average_memory_per_job": total_memory / len(job_data) if job_data else 0
+                "average_cpu_per_job": total_cpu / total_jobs if total_jobs else 0,
+                "average_memory_per_job": total_memory / total_jobs if total_jobs else 0
             },
-            "job_details": job_data[:100]  # Limit to first 100 jobs to prevent large responses
+            "job_details": job_data
         }
         
         result = {
@@ -1443,22 +1574,32 @@ def generate_job_report(owner: Optional[str] = None, time_range: Optional[str] =
         return result
 
 
+# Seconds get_utilization_stats reuses the pool's capacity; machines come and go on a scale of minutes
+_POOL_CAPACITY_TTL = 60
+
+@functools.lru_cache(maxsize=1)
+def _cached_pool_capacity(ttl_bucket):
+    """Total Cpus and Memory over the pool's startds; ttl_bucket expires the cached totals."""
+    collector = htcondor.Collector()
+    machines = collector.query(htcondor.AdTypes.Startd, "True", projection=["Cpus", "Memory"])
+    
+    total_cpus = 0
+    total_memory = 0
+    for machine in machines:
+        total_cpus += _ad_value(machine, "Cpus") or 0
+        total_memory += _ad_value(machine, "Memory") or 0
+    return total_cpus, total_memory
+
 def get_utilization_stats(time_range: Optional[str] = "24h", tool_context=None) -> dict:
     """Get resource utilization statistics over time."""
     session_id, user_id = ensure_session_exists(tool_context)
     
     try:
         schedd = htcondor.Schedd()
+        now = datetime.datetime.now()
         
         # Calculate time range
-        if time_range.endswith('h'):
-            hours = int(time_range[:-1])
-            cutoff_time = datetime.datetime.now() - datetime.timedelta(hours=hours)
-        elif time_range.endswith('d'):
-            days = int(time_range[:-1])
-            cutoff_time = datetime.datetime.now() - datetime.timedelta(days=days)
-        else:
-            cutoff_time = datetime.datetime.now() - datetime.timedelta(hours=24)
+        cutoff_time = now - _time_range_delta(time_range)
         
         # Get jobs in time range
         jobs = schedd.query(f'QDate > {int(cutoff_time.timestamp())}', 
@@ -1469,85 +1610,25 @@ def get_utilization_stats(time_range: Optional[str] = "24h", tool_context=None)
         completed_jobs = 0
         total_cpu_time = 0
         total_memory_usage = 0
-        avg_completion_time = 0
-        
         completion_times = []
         
         for ad in jobs:
-            status = ad.get("JobStatus")
-            cpu_time = ad.get("RemoteUserCpu", 0)
-            memory_usage = ad.get("MemoryUsage", 0)
-            q_date = ad.get("QDate")
-            completion_date = ad.get("CompletionDate")
-            
-            if hasattr(status, "eval"):
-                try:
-                    status = status.eval()
-                except Exception:
-                    status = None
-            
-            if hasattr(cpu_time, "eval"):
-                try:
-                    cpu_time = cpu_time.eval() or 0
-                except Exception:
-                    cpu_time = 0
-            
-            if hasattr(memory_usage, "eval"):
-                try:
-                    memory_usage = memory_usage.eval() or 0
-                except Exception:
-                    memory_usage = 0
-            
-            if hasattr(q_date, "eval"):
-                try:
-                    q_date = q_date.eval()
-                except Exception:
-                    q_date = None
-            
-            if hasattr(completion_date, "eval"):
-                try:
-                    completion_date = completion_date.eval()
-                except Exception:
-                    completion_date = None
+            total_cpu_time += _ad_value(ad, "RemoteUserCpu") or 0
+            total_memory_usage += _ad_value(ad, "MemoryUsage") or 0
             
-            if status == 4:  # Completed
+            # Only completed jobs need their dates evaluated
+            if _ad_value(ad, "JobStatus") == 4:  # Completed
                 completed_jobs += 1
+                q_date = _ad_value(ad, "QDate")
+                completion_date = _ad_value(ad, "CompletionDate")
                 if q_date and completion_date:
-                    completion_time = completion_date - q_date
-                    completion_times.append(completion_time)
-            
-            total_cpu_time += cpu_time
-            total_memory_usage += memory_usage
+                    completion_times.append(completion_date - q_date)
         
         # Calculate averages
-        if completion_times:
-            avg_completion_time = sum(completion_times) / len(completion_times)
+        avg_completion_time = sum(completion_times) / len(completion_times) if completion_times else 0
         
         # Get current system capacity
-        collector = htcondor.Collector()
-        machines = collector.query(htcondor.AdTypes.Startd, "True", projection=["Cpus", "Memory"])
-        
-        total_cpus = 0
-        total_memory = 0
-        
-        for machine in machines:
-            cpus = machine.get("Cpus", 0)
-            memory = machine.get("Memory", 0)
-            
-            if hasattr(cpus, "eval"):
-                try:
-                    cpus = cpus.eval() or 0
-                except Exception:
-                    cpus = 0
-            
-            if hasattr(memory, "eval"):
-                try:
-                    memory = memory.eval() or 0
-                except Exception:
-                    memory = 0
-            
-            total_cpus += cpus
-            total_memory += memory
+        total_cpus, total_memory = _cached_pool_capacity(int(time.monotonic() // _POOL_CAPACITY_TTL))
         
         # Calculate utilization percentages
         cpu_utilization = (total_cpu_time / (total_cpus * int(time_range[:-1]) * 3600)) * 100 if total_cpus > 0 else 0
@@ -1570,7 +1651,7 @@ def get_utilization_stats(time_range: Optional[str] = "24h", tool_context=None)
                     "total_memory_mb": total_memory
                 }
             },
-            "timestamp": datetime.datetime.now().isoformat()
+            "timestamp": now.isoformat()
         }
         
         log_tool_call(session_id, user_id, "get_utilization_stats", {"time_range": time_range}, result)
@@ -1581,330 +1662,252 @@ def get_utilization_stats(time_range: Optional[str] = "24h", tool_context=None)
         return result
 
 
-def export_job_data(format: str = "json", filters: Optional[dict] = None, tool_context=None) -> dict:
-    """Export job data in various formats."""
-    # Get proper ADK context
-    context_manager = get_context_manager()
+def _export_job_data(format, filters, _sid, _uid) -> dict:
+    fmt = format.lower()
+    if fmt not in EXPORT_FORMATS:
+        return {"success": False, "message": f"Unsupported format: {format}"}
     
-    # Extract session info from tool_context if available
-    session_id = None
-    user_id = None
-    if tool_context and hasattr(tool_context, 'htcondor_context'):
-        # Using proper ADK ToolContext
-        htcondor_ctx = tool_context.htcondor_context
-        session_id = htcondor_ctx.session_id
-        user_id = htcondor_ctx.user_id
-    else:
-        # Fallback to old method
-        session_id, user_id = ensure_session_exists(tool_context)
+    schedd = htcondor.Schedd()
     
-    try:
-        schedd = htcondor.Schedd()
-        
-        # Build constraint from filters
-        constraints = []
-        if filters:
-            if "owner" in filters:
-                constraints.append(f'Owner == "{filters["owner"]}"')
-            if "status" in filters:
-                status_map = {
-                    "running": 2, "idle": 1, "held": 5,
-                    "completed": 4, "removed": 3
-                }
-                status_code = status_map.get(filters["status"].lower())
-                if status_code is not None:
-                    constraints.append(f"JobStatus == {status_code}")
-            if "min_cpu" in filters:
-                constraints.append(f"RemoteUserCpu >= {filters['min_cpu']}")
-        
-        constraint = " and ".join(constraints) if constraints else "True"
-        
-        # Get job data
-        attrs = ["ClusterId", "ProcId", "JobStatus", "Owner", "QDate", "RemoteUserCpu", 
-                "MemoryUsage", "ImageSize", "CommittedTime"]
-        jobs = schedd.query(constraint, projection=attrs)
-        
+    # Build constraint from filters
+    constraints = []
+    if filters:
+        if "owner" in filters:
+            constraints.append(f'Owner == "{filters["owner"]}"')
+        if "status" in filters:
+            status_code = STATUS_MAP.get(filters["status"].lower())
+            if status_code is not None:
+                constraints.append(f"JobStatus == {status_code}")
+        if "min_cpu" in filters:
+            constraints.append(f"RemoteUserCpu >= {filters['min_cpu']}")
+    
+    constraint = " and ".join(constraints) if constraints else "True"
+    
+    # Get job data; the summary only reads the attributes it totals
+    jobs = schedd.query(constraint, projection=list(SUMMARY_JOB_ATTRS if fmt == "summary" else EXPORT_JOB_ATTRS))
+    
+    # Format data based on requested format
+    if fmt == "summary":
+        # Generate summary statistics straight from the ads; no per-job records needed
+        total_jobs = len(jobs)
+        total_cpu, total_memory, status_counts = _summarize_jobs(jobs)
+        
+        formatted_data = {
+            "total_jobs": total_jobs,
+            "status_distribution": dict(status_counts),
+            "total_cpu_time": total_cpu,
+            "total_memory_usage": total_memory,
+            "average_cpu_per_job": total_cpu / total_jobs if total_jobs > 0 else 0
+        }
+    elif fmt == "json":
         # Process job data
-        job_data = []
-        for ad in jobs:
-            job_info = {}
-            for attr in attrs:
-                v = ad.get(attr)
-                if hasattr(v, "eval"):
-                    try:
-                        v = v.eval()
-                    except Exception:
-                        v = None
-                job_info[attr.lower()] = v
-            job_data.append(job_info)
-        
-        # Format data based on requested format
-        if format.lower() == "json":
-            formatted_data = job_data
-        elif format.lower() == "csv":
-            # Convert to CSV format
-            if job_data:
-                headers = list(job_data[0].keys())
-                csv_lines = [",".join(headers)]
-                for job in job_data:
-                    row = [str(job.get(header, "")) for header in headers]
-                    csv_lines.append(",".join(row))
-                formatted_data = "\n".join(csv_lines)
-            else:
-                formatted_data = ""
-        elif format.lower() == "summary":
-            # Generate summary statistics
-            total_jobs = len(job_data)
-            status_counts = defaultdict(int)
-            total_cpu = 0
-            total_memory = 0
-            
-            for job in job_data:
-                status = job.get("jobstatus")
-                status_counts[status] += 1
-                
-                cpu = job.get("remoteusercpu", 0) or 0
-                memory = job.get("memoryusage", 0) or 0
-                total_cpu += cpu
-                total_memory += memory
-            
-            formatted_data = {
-                "total_jobs": total_jobs,
-                "status_distribution": dict(status_counts),
-                "total_cpu_time": total_cpu,
-                "total_memory_usage": total_memory,
-                "average_cpu_per_job": total_cpu / total_jobs if total_jobs > 0 else 0
-            }
+        formatted_data = [
+            {key: _ad_value(ad, attr) for attr, key in zip(EXPORT_JOB_ATTRS, EXPORT_JOB_ATTRS_LOWER)}
+            for ad in jobs
+        ]
+    else:
+        # Convert to CSV format; the csv module quotes fields containing commas or quotes
+        if jobs:
+            buf = io.StringIO()
+            writer = csv.writer(buf, lineterminator="\n")
+            writer.writerow(EXPORT_JOB_ATTRS_LOWER)
+            writer.writerows([_ad_value(ad, attr) for attr in EXPORT_JOB_ATTRS] for ad in jobs)
+            formatted_data = buf.getvalue()[:-1]
         else:
-            return {"success": False, "message": f"Unsupported format: {format}"}
-        
-        result = {
-            "success": True,
-            "format": format,
-            "filters": filters or {},
-            "total_jobs": len(job_data),
-            "data": formatted_data
-        }
-        
-        log_tool_call(session_id, user_id, "export_job_data", {"format": format, "filters": filters}, result)
-        return result
-    except Exception as e:
-        result = {"success": False, "message": f"Error exporting job data: {str(e)}"}
-        log_tool_call(session_id, user_id, "export_job_data", {"format": format, "filters": filters}, result)
-        return result
+            formatted_data = ""
+    
+    result = {
+        "success": True,
+        "format": format,
+        "filters": filters or {},
+        "total_jobs": len(jobs),
+        "data": formatted_data
+    }
+    
+    log_tool_call(_sid, _uid, "export_job_data", {"format": format, "filters": filters}, result)
+    return result
+
+
+@with_htcondor_context
+def export_job_data(format: str = "json", filters: Optional[dict] = None, tool_context=None, *, _sid=None, _uid=None) -> dict:
+    """Export job data in various formats."""
+    return _safe_run("export_job_data", _sid, _uid, {"format": format, "filters": filters},
+                     lambda: _export_job_data(format, filters, _sid, _uid), "Error exporting job data")
 
 
 # ===== NEW CONTEXT-AWARE TOOLS =====
 
-def save_job_report(cluster_id: int, report_name: str, tool_context=None) -> dict:
-    """Save a job report as an artifact using ADK Context."""
-    # Get proper ADK context
-    context_manager = get_context_manager()
+# Fixed result messages for the context-aware tools
+_MSG_REPORT_SAVED = "Job report saved as artifact"
+_MSG_REPORT_SAVED_FALLBACK = "Job report saved as artifact (fallback)"
+_MSG_REPORT_LOADED = "Job report loaded successfully"
+_MSG_MEMORY_SEARCHED = "Memory search completed"
+_MSG_CONTEXT_SUMMARY = "User context summary retrieved"
+
+def _save_job_report(cluster_id, report_name, tool_context, _sid, _uid) -> dict:
+    # Get simplified session context manager
+    context_manager = get_simplified_session_context_manager()
     
-    # Extract session info from tool_context if available
-    session_id = None
-    user_id = None
-    if tool_context and hasattr(tool_context, 'htcondor_context'):
-        # Using proper ADK ToolContext
-        htcondor_ctx = tool_context.htcondor_context
-        session_id = htcondor_ctx.session_id
-        user_id = htcondor_ctx.user_id
-    else:
-        # Fallback to old method
-        session_id, user_id = ensure_session_exists(tool_context)
+    # Get job status first
+    job_status_result = get_job_status(cluster_id, tool_context)
     
-    try:
-        # Get job status first
-        job_status_result = get_job_status(cluster_id, tool_context)
-        
-        if not job_status_result.get("success"):
-            result = {"success": False, "message": f"Failed to get job status: {job_status_result.get('message')}"}
-            log_tool_call(session_id, user_id, "save_job_report", {"cluster_id": cluster_id, "report_name": report_name}, result)
-            return result
-        
-        # Create report data
-        report_data = {
-            "cluster_id": cluster_id,
-            "report_name": report_name,
-            "generated_at": datetime.datetime.now().isoformat(),
-            "job_status": job_status_result.get("job_status", {}),
-            "user_id": user_id,
-            "session_id": session_id
-        }
-        
-        # Save as artifact using ADK Context
-        if tool_context and hasattr(tool_context, 'save_htcondor_artifact'):
-            artifact_id = tool_context.save_htcondor_artifact(report_name, report_data)
-            result = {
-                "success": True,
-                "message": f"Job report saved as artifact",
-                "artifact_id": artifact_id,
-                "report_name": report_name,
-                "cluster_id": cluster_id
-            }
-        else:
-            # Fallback: save to context manager directly
-            artifact_id = context_manager._save_artifact(session_id, report_name, report_data)
-            result = {
-                "success": True,
-                "message": f"Job report saved as artifact (fallback)",
-                "artifact_id": artifact_id,
-                "report_name": report_name,
-                "cluster_id": cluster_id
-            }
-        
-        log_tool_call(session_id, user_id, "save_job_report", {"cluster_id": cluster_id, "report_name": report_name}, result)
-        return result
-        
-    except Exception as e:
-        result = {"success": False, "message": f"Error saving job report: {str(e)}"}
-        log_tool_call(session_id, user_id, "save_job_report", {"cluster_id": cluster_id, "report_name": report_name}, result)
+    if not job_status_result.get("success"):
+        result = {"success": False, "message": f"Failed to get job status: {job_status_result.get('message')}"}
+        log_tool_call(_sid, _uid, "save_job_report", {"cluster_id": cluster_id, "report_name": report_name}, result)
         return result
-
-
-def load_job_report(report_name: str, tool_context=None) -> dict:
-    """Load a previously saved job report using ADK Context."""
-    # Get proper ADK context
-    context_manager = get_context_manager()
     
-    # Extract session info from tool_context if available
-    session_id = None
-    user_id = None
-    if tool_context and hasattr(tool_context, 'htcondor_context'):
-        # Using proper ADK ToolContext
-        htcondor_ctx = tool_context.htcondor_context
-        session_id = htcondor_ctx.session_id
-        user_id = htcondor_ctx.user_id
-    else:
-        # Fallback to old method
-        session_id, user_id = ensure_session_exists(tool_context)
+    # Create report data
+    report_data = {
+        "cluster_id": cluster_id,
+        "report_name": report_name,
+        # Formatted to ISO 8601 only when the artifact is serialized
+        "generated_at": datetime.datetime.now(),
+        "job_status": job_status_result.get("job_status", {}),
+        "user_id": _uid,
+        "session_id": _sid
+    }
     
-    try:
-        # Load artifact using ADK Context
-        if tool_context and hasattr(tool_context, 'load_htcondor_artifact'):
-            artifact_data = tool_context.load_htcondor_artifact(report_name)
-        else:
-            # Fallback: load from context manager directly
-            artifact_data = context_manager._load_artifact(session_id, report_name)
-        
-        if not artifact_data:
-            result = {"success": False, "message": f"No report found with name: {report_name}"}
-            log_tool_call(session_id, user_id, "load_job_report", {"report_name": report_name}, result)
-            return result
-        
+    # Save as artifact using ADK Context
+    save_artifact = getattr(tool_context, 'save_htcondor_artifact', None) if tool_context else None
+    if save_artifact is not None:
+        artifact_id = save_artifact(report_name, report_data)
         result = {
             "success": True,
-            "message": f"Job report loaded successfully",
+            "message": _MSG_REPORT_SAVED,
+            "artifact_id": artifact_id,
             "report_name": report_name,
-            "artifact_data": artifact_data
+            "cluster_id": cluster_id
         }
-        
-        log_tool_call(session_id, user_id, "load_job_report", {"report_name": report_name}, result)
-        return result
-        
-    except Exception as e:
-        result = {"success": False, "message": f"Error loading job report: {str(e)}"}
-        log_tool_call(session_id, user_id, "load_job_report", {"report_name": report_name}, result)
-        return result
+    else:
+        # Fallback: save to context manager directly
+        artifact_id = context_manager.save_artifact(_sid, report_name, report_data)
+        result = {
+            "success": True,
+            "message": _MSG_REPORT_SAVED_FALLBACK,
+            "artifact_id": artifact_id,
+            "report_name": report_name,
+            "cluster_id": cluster_id
+        }
+    
+    log_tool_call(_sid, _uid, "save_job_report", {"cluster_id": cluster_id, "report_name": report_name}, result)
+    return result
 
 
-def search_job_memory(query: str, tool_context=None) -> dict:
-    """Search memory for job-related information using ADK Context."""
-    # Get proper ADK context
-    context_manager = get_context_manager()
+@with_htcondor_context
+def save_job_report(cluster_id: int, report_name: str, tool_context=None, *, _sid=None, _uid=None) -> dict:
+    """Save a job report as an artifact using ADK Context."""
+    return _safe_run("save_job_report", _sid, _uid, {"cluster_id": cluster_id, "report_name": report_name},
+                     lambda: _save_job_report(cluster_id, report_name, tool_context, _sid, _uid), "Error saving job report")
+
+
+def _load_job_report(report_name, tool_context, _sid, _uid) -> dict:
+    # Get simplified session context manager
+    context_manager = get_simplified_session_context_manager()
     
-    # Extract session info from tool_context if available
-    session_id = None
-    user_id = None
-    if tool_context and hasattr(tool_context, 'htcondor_context'):
-        # Using proper ADK ToolContext
-        htcondor_ctx = tool_context.htcondor_context
-        session_id = htcondor_ctx.session_id
-        user_id = htcondor_ctx.user_id
+    # Load artifact using ADK Context
+    load_artifact = getattr(tool_context, 'load_htcondor_artifact', None) if tool_context else None
+    if load_artifact is not None:
+        artifact_data = load_artifact(report_name)
     else:
-        # Fallback to old method
-        session_id, user_id = ensure_session_exists(tool_context)
+        # Fallback: load from context manager directly
+        artifact_data = context_manager.load_artifact(_sid, report_name)
     
-    try:
-        # Search memory using ADK Context
-        if tool_context and hasattr(tool_context, 'search_htcondor_memory'):
-            search_results = tool_context.search_htcondor_memory(query)
-        else:
-            # Fallback: search from context manager directly
-            search_results = context_manager._search_memory(user_id, query)
-        
-        result = {
-            "success": True,
-            "message": f"Memory search completed",
-            "query": query,
-            "results_count": len(search_results),
-            "search_results": search_results
-        }
-        
-        log_tool_call(session_id, user_id, "search_job_memory", {"query": query}, result)
-        return result
-        
-    except Exception as e:
-        result = {"success": False, "message": f"Error searching memory: {str(e)}"}
-        log_tool_call(session_id, user_id, "search_job_memory", {"query": query}, result)
+    if not artifact_data:
+        result = {"success": False, "message": f"No report found with name: {report_name}"}
+        log_tool_call(_sid, _uid, "load_job_report", {"report_name": report_name}, result)
         return result
+    
+    result = {
+        "success": True,
+        "message": _MSG_REPORT_LOADED,
+        "report_name": report_name,
+        "artifact_data": artifact_data
+    }
+    
+    log_tool_call(_sid, _uid, "load_job_report", {"report_name": report_name}, result)
+    return result
 
 
-def get_user_context_summary(tool_context=None) -> dict:
-    """Get a comprehensive summary of the user's context and history."""
+@with_htcondor_context
+def load_job_report(report_name: str, tool_context=None, *, _sid=None, _uid=None) -> dict:
+    """Load a previously saved job report using ADK Context."""
+    return _safe_run("load_job_report", _sid, _uid, {"report_name": report_name},
+                     lambda: _load_job_report(report_name, tool_context, _sid, _uid), "Error loading job report")
+
+
+def _search_job_memory(query, tool_context, _sid, _uid) -> dict:
     # Get simplified session context manager
-    scm = get_simplified_session_context_manager()
+    context_manager = get_simplified_session_context_manager()
     
-    # Extract session info from tool_context if available
-    session_id = None
-    user_id = None
-    if tool_context and hasattr(tool_context, 'htcondor_context'):
-        # Using proper ADK ToolContext
-        htcondor_ctx = tool_context.htcondor_context
-        session_id = htcondor_ctx.session_id
-        user_id = htcondor_ctx.user_id
+    # Search memory using ADK Context
+    search_memory = getattr(tool_context, 'search_htcondor_memory', None) if tool_context else None
+    if search_memory is not None:
+        search_results = search_memory(query)
     else:
-        # Fallback to old method
-        session_id, user_id = ensure_session_exists(tool_context)
+        # Fallback: search from context manager directly
+        search_results = context_manager.search_memory(_uid, query)
     
-    try:
-        # Get user memory
-        user_memory = scm.get_user_memory(user_id)
-        
-        # Get current session context
-        current_context = None
-        if tool_context and hasattr(tool_context, 'htcondor_context'):
-            current_context = tool_context.htcondor_context
-        
-        # Get recent job history
-        recent_jobs = []
-        if current_context and current_context.job_history:
-            recent_jobs = current_context.job_history[-10:]  # Last 10 jobs
-        
-        # Get user preferences
-        preferences = {}
-        if current_context and current_context.preferences:
-            preferences = current_context.preferences
-        
-        result = {
-            "success": True,
-            "message": f"User context summary retrieved",
-            "user_id": user_id,
-            "session_id": session_id,
-            "current_jobs": current_context.current_jobs if current_context else [],
-            "recent_job_history": recent_jobs,
-            "user_preferences": preferences,
-            "memory_entries": len(user_memory),
-            "session_active": scm.validate_session(session_id) if session_id else False
-        }
-        
-        log_tool_call(session_id, user_id, "get_user_context_summary", {}, result)
-        return result
-        
-    except Exception as e:
-        result = {"success": False, "message": f"Error getting user context summary: {str(e)}"}
-        log_tool_call(session_id, user_id, "get_user_context_summary", {}, result)
-        return result
+    result = {
+        "success": True,
+        "message": _MSG_MEMORY_SEARCHED,
+        "query": query,
+        "results_count": len(search_results),
+        "search_results": search_results
+    }
+    
+    log_tool_call(_sid, _uid, "search_job_memory", {"query": query}, result)
+    return result
+
+
+@with_htcondor_context
+def search_job_memory(query: str, tool_context=None, *, _sid=None, _uid=None) -> dict:
+    """Search memory for job-related information using ADK Context."""
+    return _safe_run("search_job_memory", _sid, _uid, {"query": query},
+                     lambda: _search_job_memory(query, tool_context, _sid, _uid), "Error searching memory")
+
+
+def _get_user_context_summary(_sid, _uid, _hctx) -> dict:
+    # Get simplified session context manager
+    scm = get_simplified_session_context_manager()
+    
+    # Get user memory
+    user_memory = scm.get_user_memory(_uid)
+    
+    # Get current session context
+    current_context = _hctx
+    
+    # Get recent job history
+    recent_jobs = []
+    if current_context and current_context.job_history:
+        # Last 10 jobs, read from the tail of the bounded deque
+        recent_jobs = list(itertools.islice(reversed(current_context.job_history), 10))[::-1]
+    
+    # Get user preferences
+    preferences = {}
+    if current_context and current_context.preferences:
+        preferences = current_context.preferences
+    
+    result = {
+        "success": True,
+        "message": _MSG_CONTEXT_SUMMARY,
+        "user_id": _uid,
+        "session_id": _sid,
+        "current_jobs": current_context.current_jobs if current_context else [],
+        "recent_job_history": recent_jobs,
+        "user_preferences": preferences,
+        "memory_entries": len(user_memory),
+        "session_active": scm.validate_session(_sid) if _sid else False
+    }
+    
+    log_tool_call(_sid, _uid, "get_user_context_summary", {}, result)
+    return result
+
+
+@with_htcondor_context
+def get_user_context_summary(tool_context=None, *, _sid=None, _uid=None, _hctx=None) -> dict:
+    """Get a comprehensive summary of the user's context and history."""
+    return _safe_run("get_user_context_summary", _sid, _uid, {},
+                     lambda: _get_user_context_summary(_sid, _uid, _hctx), "Error getting user context summary")
 
 
 def list_htcondor_tools(tool_context=None) -> dict:
@@ -1959,141 +1962,192 @@ def list_htcondor_tools(tool_context=None) -> dict:
         log_tool_call(session_id, user_id, "list_htcondor_tools", {}, result)
         return result
 
-def add_to_memory(key: str, value: str, global_memory: bool = False, tool_context=None) -> dict:
-    """Add information to memory using ADK Context."""
+def _add_to_memory(key, value, global_memory, _sid, _uid) -> dict:
     # Get simplified session context manager
     scm = get_simplified_session_context_manager()
     
-    # Extract session info from tool_context if available
-    session_id = None
-    user_id = None
-    if tool_context and hasattr(tool_context, 'htcondor_context'):
-        # Using proper ADK ToolContext
-        htcondor_ctx = tool_context.htcondor_context
-        session_id = htcondor_ctx.session_id
-        user_id = htcondor_ctx.user_id
-    else:
-        # Fallback to old method
-        session_id, user_id = ensure_session_exists(tool_context)
+    # Add to memory using context manager
+    scm.add_to_memory(_uid, key, value, global_memory)
     
-    try:
-        # Add to memory using context manager
-        scm.add_to_memory(user_id, key, value, global_memory)
-        
-        result = {
-            "success": True,
-            "message": f"Information added to {'global' if global_memory else 'user'} memory",
-            "key": key,
-            "value": value,
-            "memory_type": "global" if global_memory else "user"
-        }
-        
-        log_tool_call(session_id, user_id, "add_to_memory", {"key": key, "value": value, "global_memory": global_memory}, result)
-        return result
-        
-    except Exception as e:
-        result = {"success": False, "message": f"Error adding to memory: {str(e)}"}
-        log_tool_call(session_id, user_id, "add_to_memory", {"key": key, "value": value, "global_memory": global_memory}, result)
-        return result
+    result = {
+        "success": True,
+        "message": f"Information added to {'global' if global_memory else 'user'} memory",
+        "key": key,
+        "value": value,
+        "memory_type": "global" if global_memory else "user"
+    }
+    
+    log_tool_call(_sid, _uid, "add_to_memory", {"key": key, "value": value, "global_memory": global_memory}, result)
+    return result
+
+
+@with_htcondor_context
+def add_to_memory(key: str, value: str, global_memory: bool = False, tool_context=None, *, _sid=None, _uid=None) -> dict:
+    """Add information to memory using ADK Context."""
+    return _safe_run("add_to_memory", _sid, _uid, {"key": key, "value": value, "global_memory": global_memory},
+                     lambda: _add_to_memory(key, value, global_memory, _sid, _uid), "Error adding to memory")
+
+
+def _function_tool(func) -> FunctionTool:
+    """Wrap a tool function, caching its signature for FunctionTool's per-call introspection."""
+    # FunctionTool.run_async calls inspect.signature() on every invocation; a stored
+    # __signature__ is returned as-is instead of being rebuilt from the code object
+    if "__signature__" not in vars(func):
+        func.__signature__ = inspect.signature(func)
+    return FunctionTool(func=func)
 
 
-ADK_AF_TOOLS = {
-    "list_htcondor_tools": FunctionTool(func=list_htcondor_tools),
-    "list_jobs": FunctionTool(func=list_jobs),
-    "get_job_status": FunctionTool(func=get_job_status),
-    "submit_job": FunctionTool(func=submit_job),
+ADK_AF_TOOLS: Final[dict[str, FunctionTool]] = {
+    "list_htcondor_tools": _function_tool(list_htcondor_tools),
+    "list_jobs": _function_tool(list_jobs),
+    "get_job_status": _function_tool(get_job_status),
+    "submit_job": _function_tool(submit_job),
     
     # Advanced Job Information
-    "get_job_history": FunctionTool(func=get_job_history),
+    "get_job_history": _function_tool(get_job_history),
     
     # Session Management
-    "list_user_sessions": FunctionTool(func=list_user_sessions),
-    "continue_last_session": FunctionTool(func=continue_last_session),
-    "continue_specific_session": FunctionTool(func=continue_specific_session),
-    "start_fresh_session": FunctionTool(func=start_fresh_session),
-    "get_session_history": FunctionTool(func=get_session_history),
-    "get_session_summary": FunctionTool(func=get_session_summary),
-    "get_user_conversation_memory": FunctionTool(func=get_user_conversation_memory),
+    "list_user_sessions": _function_tool(list_user_sessions),
+    "continue_last_session": _function_tool(continue_last_session),
+    "continue_specific_session": _function_tool(continue_specific_session),
+    "start_fresh_session": _function_tool(start_fresh_session),
+    "get_session_history": _function_tool(get_session_history),
+    "get_session_summary": _function_tool(get_session_summary),
+    "get_user_conversation_memory": _function_tool(get_user_conversation_memory),
     
     # Reporting and Analytics
-    "generate_job_report": FunctionTool(func=generate_job_report),
-    "get_utilization_stats": FunctionTool(func=get_utilization_stats),
-    "export_job_data": FunctionTool(func=export_job_data),
+    "generate_job_report": _function_tool(generate_job_report),
+    "get_utilization_stats": _function_tool(get_utilization_stats),
+    "export_job_data": _function_tool(export_job_data),
     
     # Context-Aware Tools (ADK Context Integration)
-    "save_job_report": FunctionTool(func=save_job_report),
-    "load_job_report": FunctionTool(func=load_job_report),
-    "search_job_memory": FunctionTool(func=search_job_memory),
-    "get_user_context_summary": FunctionTool(func=get_user_context_summary),
-    "add_to_memory": FunctionTool(func=add_to_memory),
+    "save_job_report": _function_tool(save_job_report),
+    "load_job_report": _function_tool(load_job_report),
+    "search_job_memory": _function_tool(search_job_memory),
+    "get_user_context_summary": _function_tool(get_user_context_summary),
+    "add_to_memory": _function_tool(add_to_memory),
 }
 
 
-@app.list_tools()
-async def list_mcp_tools() -> list[mcp_types.Tool]:
-    logging.info("Received list_tools request.")
+def _build_tool_schemas() -> list[mcp_types.Tool]:
+    """Convert every ADK tool to its MCP schema, skipping tools that fail."""
     schemas = []
     for name, inst in ADK_AF_TOOLS.items():
         try:
             if not inst.name:
                 inst.name = name
-                logging.info(f"Converting tool schema for: {name}")
-            schema = adk_to_mcp_tool_type(inst)
-            schemas.append(schema)
+            schemas.append(adk_to_mcp_tool_type(inst))
             logging.info(f"Successfully converted tool schema for: {name}")
         except Exception as e:
             logging.error(f"Error converting tool schema for '{name}': {e}", exc_info=True)
-            # Skip this tool if it fails to convert
-            continue
     return schemas
 
 
+# ADK_AF_TOOLS is static, so the MCP schemas are built once at import time
+_CACHED_TOOL_SCHEMAS: Final[list[mcp_types.Tool]] = _build_tool_schemas()
+
+def _dumps(obj) -> str:
+    """Serialize a tool response to compact JSON text, using orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTS).decode()
+        except TypeError:
+            # orjson is stricter than json (e.g. ints wider than 64 bits)
+            pass
+    return json.dumps(obj, separators=(",", ":"))
+
+# Bound once so call_mcp_tool skips the module attribute lookup per response
+_TextContent = mcp_types.TextContent
+
+# Bound run_async per tool, so dispatch is a single dict lookup
+_TOOL_RUNNERS: Final[dict] = {name: inst.run_async for name, inst in ADK_AF_TOOLS.items()}
+
+
+@app.list_tools()
+async def list_mcp_tools() -> list[mcp_types.Tool]:
+    logging.info("Received list_tools request.")
+    return _CACHED_TOOL_SCHEMAS
+
+
 @app.call_tool()
 async def call_mcp_tool(name: str, arguments: dict) -> list[mcp_types.TextContent]:
     logging.info(f"call_tool for '{name}' args: {arguments}")
     
-    # Create a copy of arguments to avoid modifying the original
-    tool_args = arguments.copy()
+    run = _TOOL_RUNNERS.get(name)
+    if run is None:
+        return [_TextContent(type="text", text=_dumps({
+            "success": False,
+            "message": f"Tool '{name}' not found"
+        }))]
     
     # Extract session context from arguments if present (but don't remove required parameters)
     # Note: If no session_id is provided, the tool functions will automatically create one
-    session_id = tool_args.get('session_id', None)
+    session_id = arguments.get('session_id')
     tool_context = {'session_id': session_id} if session_id else None
     
     logging.info(f"Extracted session_id: {session_id}, tool_context: {tool_context}")
     
-    if name in ADK_AF_TOOLS:
-        inst = ADK_AF_TOOLS[name]
-        try:
-            # Add tool_context to arguments
-            if tool_context:
-                tool_args['tool_context'] = tool_context
-            
-            resp = await inst.run_async(args=tool_args, tool_context=tool_context)
-            logging.info(f"Tool '{name}' success.")
-            return [mcp_types.TextContent(type="text", text=json.dumps(resp, indent=2))]
-        except Exception as e:
-            logging.error(f"Error executing '{name}': {e}", exc_info=True)
-            return [mcp_types.TextContent(type="text", text=json.dumps({
-                "success": False,
-                "message": str(e)
-            }))]
-    else:
-        return [mcp_types.TextContent(type="text", text=json.dumps({
+    try:
+        # run_async copies the arguments and injects tool_context itself,
+        # so the request arguments are passed through without a copy
+        resp = await run(args=arguments, tool_context=tool_context)
+        logging.info(f"Tool '{name}' success.")
+        # The consumer is the MCP client, so skip pretty-printing
+        return [_TextContent(type="text", text=_dumps(resp))]
+    except Exception as e:
+        logging.error(f"Error executing '{name}': {e}", exc_info=True)
+        return [_TextContent(type="text", text=_dumps({
             "success": False,
-            "message": f"Tool '{name}' not found"
+            "message": str(e)
         }))]
 
 
+async def _log_flush_task():
+    """Write buffered activity-log records to the file every _LOG_FLUSH_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(_LOG_FLUSH_INTERVAL)
+        _log_buffer_handler.flush()
+
+def _handle_sigterm(server_task: asyncio.Task):
+    """Stop the server on SIGTERM, which skips atexit, so the shutdown path still runs."""
+    logging.info("Received SIGTERM, shutting down.")
+    _log_buffer_handler.flush()
+    server_task.cancel()
+
 async def run_mcp_stdio_server():
-    async with mcp.server.stdio.stdio_server() as (r, w):
-        logging.info("Starting MCP stdio server...")
-        await app.run(r, w, InitializationOptions(
-            server_name=app.name,
-            server_version="0.1.0",
-            capabilities=app.get_capabilities(notification_options=NotificationOptions(), experimental_capabilities={}),
-        ))
-        logging.info("STDIO session ended.")
+    global _LOG_QUEUE
+    
+    loop = asyncio.get_running_loop()
+    if hasattr(signal, "SIGHUP"):
+        # Operators signal a config change with SIGHUP; re-read the pool list then
+        loop.add_signal_handler(signal.SIGHUP, reload_pool_config)
+        # MCP clients stop the server with SIGTERM (POSIX only, like SIGHUP)
+        loop.add_signal_handler(signal.SIGTERM, _handle_sigterm, asyncio.current_task())
+    
+    # Move tool-call logging onto a background writer for the server's lifetime
+    _LOG_QUEUE = asyncio.Queue(maxsize=_LOG_QUEUE_MAXSIZE)
+    log_writer = asyncio.create_task(_log_writer_task(_LOG_QUEUE))
+    log_flusher = asyncio.create_task(_log_flush_task())
+    
+    try:
+        async with mcp.server.stdio.stdio_server() as (r, w):
+            logging.info("Starting MCP stdio server...")
+            await app.run(r, w, InitializationOptions(
+                server_name=app.name,
+                server_version="0.1.0",
+                capabilities=app.get_capabilities(notification_options=NotificationOptions(), experimental_capabilities={}),
+            ))
+            logging.info("STDIO session ended.")
+    finally:
+        log_writer.cancel()
+        queue, _LOG_QUEUE = _LOG_QUEUE, None
+        # Flush whatever the writer had not picked up yet
+        pending = []
+        while not queue.empty():
+            pending.append(queue.get_nowait())
+        _write_tool_calls(pending)
+        log_flusher.cancel()
+        _log_buffer_handler.flush()
 
 
 if __name__ == "__main__":
@@ -2102,6 +2156,8 @@ if __name__ == "__main__":
         asyncio.run(run_mcp_stdio_server())
     except KeyboardInterrupt:
         logging.info("Server stopped by user.")
+    except asyncio.CancelledError:
+        logging.info("Server stopped by SIGTERM.")
     except Exception as e:
         logging.critical(f"Unhandled exception: {e}", exc_info=True)
     finally:
@@ -12,12 +12,22 @@ import datetime
 import re
 import os
 import logging
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Deque, Tuple
 from dataclasses import dataclass, asdict
 
 logger = logging.getLogger(__name__)
 
+# Number of job accesses kept in HTCondorContext.job_history
+JOB_HISTORY_LIMIT = 50
+
+def _json_default(obj: Any) -> str:
+    """Serialize values json can't handle; datetimes are formatted as ISO 8601."""
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    return str(obj)
+
 @dataclass
 class HTCondorContext:
     """HTCondor-specific context data."""
@@ -26,15 +36,15 @@ class HTCondorContext:
     current_jobs: List[int] = None
     preferences: Dict[str, Any] = None
     last_query: Optional[str] = None
-    job_history: List[Dict[str, Any]] = None
+    job_history: Deque[Dict[str, Any]] = None
     
     def __post_init__(self):
         if self.current_jobs is None:
             self.current_jobs = []
         if self.preferences is None:
             self.preferences = {}
-        if self.job_history is None:
-            self.job_history = []
+        # Bounded so the oldest entries fall off as new jobs are accessed
+        self.job_history = deque(self.job_history or (), maxlen=JOB_HISTORY_LIMIT)
 
 class SimplifiedSessionContextManager:
     """Simplified session and context manager using only 3 tables."""
@@ -49,9 +59,20 @@ class SimplifiedSessionContextManager:
         self.session_timeout_hours = 200
         self._init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the session database with the per-connection tuning applied."""
+        conn = sqlite3.connect(self.db_path)
+        # Safe with WAL: a crash can lose the last commits but never corrupts the database
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+    
     def _init_database(self):
         """Create simplified database tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            # WAL lets the tools read while the log writer commits; the mode persists in the file
+            conn.execute("PRAGMA journal_mode=WAL")
+            
             # Core sessions table with metadata
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS sessions (
@@ -77,7 +98,10 @@ class SimplifiedSessionContextManager:
             """)
             
             # Create indexes for better performance
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_conversations_session_id ON conversations(session_id)")
+            # (session_id, timestamp) serves the per-session history queries without a sort step
+            # and supersedes the old session_id-only index
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_conversations_session_ts ON conversations(session_id, timestamp DESC)")
+            conn.execute("DROP INDEX IF EXISTS idx_conversations_session_id")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_conversations_type ON conversations(message_type)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_user_id ON sessions(user_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_active ON sessions(is_active)")
@@ -106,7 +130,7 @@ class SimplifiedSessionContextManager:
         
         metadata_json = json.dumps(metadata)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 INSERT INTO sessions (session_id, user_id, metadata)
                 VALUES (?, ?, ?)
@@ -116,9 +140,14 @@ class SimplifiedSessionContextManager:
         logger.info(f"Created session {session_id} for user {user_id}")
         return session_id
     
+    def _session_expired(self, last_activity: str) -> bool:
+        """Whether a session whose last activity was at last_activity has timed out."""
+        last = datetime.datetime.fromisoformat(last_activity)
+        return datetime.datetime.now() - last > datetime.timedelta(hours=self.session_timeout_hours)
+    
     def validate_session(self, session_id: str) -> bool:
         """Check if session is valid and active."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("""
                 SELECT is_active, last_activity FROM sessions WHERE session_id = ?
             """, (session_id,))
@@ -128,8 +157,7 @@ class SimplifiedSessionContextManager:
                 return False
             
             # Check expiration
-            last_activity = datetime.datetime.fromisoformat(row[1])
-            if datetime.datetime.now() - last_activity > datetime.timedelta(hours=self.session_timeout_hours):
+            if self._session_expired(row[1]):
                 self.deactivate_session(session_id)
                 return False
             
@@ -137,7 +165,7 @@ class SimplifiedSessionContextManager:
     
     def update_session_activity(self, session_id: str):
         """Update session activity timestamp."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 UPDATE sessions SET last_activity = CURRENT_TIMESTAMP WHERE session_id = ?
             """, (session_id,))
@@ -145,18 +173,18 @@ class SimplifiedSessionContextManager:
     
     def deactivate_session(self, session_id: str):
         """Deactivate a session."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("UPDATE sessions SET is_active = FALSE WHERE session_id = ?", (session_id,))
             conn.commit()
     
-    def add_message(self, session_id: str, message_type: str, content: str) -> str:
-        """Add a message to conversation history."""
-        if not self.validate_session(session_id):
+    def add_message(self, session_id: str, message_type: str, content: str, validate: bool = True) -> str:
+        """Add a message to conversation history; validate=False trusts an already-checked session."""
+        if validate and not self.validate_session(session_id):
             raise ValueError("Invalid or expired session")
         
         conversation_id = str(uuid.uuid4())
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 INSERT INTO conversations (conversation_id, session_id, message_type, content)
                 VALUES (?, ?, ?, ?)
@@ -166,26 +194,104 @@ class SimplifiedSessionContextManager:
         self.update_session_activity(session_id)
         return conversation_id
     
+    def add_messages(self, messages: List[Tuple[str, str, str]], validate: bool = True) -> int:
+        """Add (session_id, message_type, content) messages in one transaction.
+        
+        Messages for invalid or expired sessions are skipped (validate=False trusts the
+        caller's check); returns how many were stored.
+        """
+        valid_sessions = {}
+        rows = []
+        for session_id, message_type, content in messages:
+            if session_id not in valid_sessions:
+                valid_sessions[session_id] = not validate or self.validate_session(session_id)
+            if valid_sessions[session_id]:
+                rows.append((str(uuid.uuid4()), session_id, message_type, content))
+        
+        if not rows:
+            return 0
+        
+        with self._connect() as conn:
+            conn.executemany("""
+                INSERT INTO conversations (conversation_id, session_id, message_type, content)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            conn.executemany("""
+                UPDATE sessions SET last_activity = CURRENT_TIMESTAMP WHERE session_id = ?
+            """, [(sid,) for sid, valid in valid_sessions.items() if valid])
+            conn.commit()
+        
+        return len(rows)
+    
     def get_conversation_history(self, session_id: str, limit: int = 20) -> List[Dict]:
         """Get conversation history for a session."""
         if not self.validate_session(session_id):
             return []
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            return self._fetch_history(conn, session_id, limit)
+    
+    @staticmethod
+    def _fetch_history(conn: sqlite3.Connection, session_id: str, limit: int) -> List[Dict]:
+        """Read a session's latest messages on an open connection, without validating it."""
+        cursor = conn.execute("""
+            SELECT * FROM conversations 
+            WHERE session_id = ? 
+            ORDER BY timestamp DESC 
+            LIMIT ?
+        """, (session_id, limit))
+        cursor.row_factory = sqlite3.Row
+        
+        conversations = [dict(row) for row in cursor.fetchall()]
+        return list(reversed(conversations))  # Return in chronological order
+    
+    def get_conversation_history_bulk(self, session_ids: List[str], limit: int = 20) -> Dict[str, List[Dict]]:
+        """Get the conversation history of several sessions in one query, keyed by session_id.
+        
+        Each session is capped at `limit` messages. As with get_conversation_history,
+        inactive or expired sessions get an empty history and expired ones are deactivated.
+        """
+        if not session_ids:
+            return {}
+        
+        history: Dict[str, List[Dict]] = {session_id: [] for session_id in session_ids}
+        with self._connect() as conn:
+            placeholders = ", ".join("?" * len(session_ids))
+            rows = conn.execute(f"""
+                SELECT session_id, is_active, last_activity FROM sessions WHERE session_id IN ({placeholders})
+            """, session_ids).fetchall()
+            valid_ids: List[str] = []
+            expired_ids: List[str] = []
+            for session_id, is_active, last_activity in rows:
+                if not is_active:
+                    continue
+                (expired_ids if self._session_expired(last_activity) else valid_ids).append(session_id)
+            if expired_ids:
+                conn.executemany("UPDATE sessions SET is_active = FALSE WHERE session_id = ?",
+                                 [(session_id,) for session_id in expired_ids])
+                conn.commit()
+            if not valid_ids:
+                return history
+            
+            placeholders = ", ".join("?" * len(valid_ids))
             conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM conversations 
-                WHERE session_id = ? 
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            """, (session_id, limit))
+            cursor = conn.execute(f"""
+                SELECT conversation_id, session_id, timestamp, message_type, content FROM (
+                    SELECT *, ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY timestamp DESC) AS rn
+                    FROM conversations 
+                    WHERE session_id IN ({placeholders})
+                )
+                WHERE rn <= ?
+                ORDER BY session_id, timestamp
+            """, (*valid_ids, limit))
             
-            conversations = [dict(row) for row in cursor.fetchall()]
-            return list(reversed(conversations))  # Return in chronological order
+            for row in cursor:
+                history[row['session_id']].append(dict(row))
+        return history
     
     def get_session_metadata(self, session_id: str) -> Dict:
         """Get session metadata."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute("SELECT metadata FROM sessions WHERE session_id = ?", (session_id,))
             row = cursor.fetchone()
             
@@ -195,7 +301,7 @@ class SimplifiedSessionContextManager:
     
     def update_session_metadata(self, session_id: str, metadata: Dict):
         """Update session metadata."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 UPDATE sessions SET metadata = ? WHERE session_id = ?
             """, (json.dumps(metadata), session_id))
@@ -206,7 +312,7 @@ class SimplifiedSessionContextManager:
         if not self.validate_session(session_id):
             return {"error": "Invalid or expired session"}
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.execute("SELECT user_id, metadata FROM sessions WHERE session_id = ?", (session_id,))
             row = cursor.fetchone()
@@ -214,16 +320,43 @@ class SimplifiedSessionContextManager:
             if not row:
                 return {"error": "Session not found"}
             
-            user_id = row['user_id']
-            metadata = json.loads(row['metadata'])
-            history = self.get_conversation_history(session_id, limit=10)
+            history = self._fetch_history(conn, session_id, 10)
+        
+        return self._build_session_context(row['user_id'], row['metadata'], history)
+    
+    def touch_and_get_session(self, session_id: str) -> Optional[Dict]:
+        """Validate a session, mark it active now and return its context, or None if invalid or expired."""
+        with self._connect() as conn:
+            row = conn.execute("""
+                SELECT is_active, last_activity, user_id, metadata FROM sessions WHERE session_id = ?
+            """, (session_id,)).fetchone()
             
-            return {
-                "user_id": user_id,
-                "preferences": metadata.get('preferences', {}),
-                "recent_history": history,
-                "job_references": self._extract_job_references(history)
-            }
+            if not row or not row[0]:
+                return None
+            
+            # Check expiration
+            if self._session_expired(row[1]):
+                conn.execute("UPDATE sessions SET is_active = FALSE WHERE session_id = ?", (session_id,))
+                conn.commit()
+                return None
+            
+            conn.execute("""
+                UPDATE sessions SET last_activity = CURRENT_TIMESTAMP WHERE session_id = ?
+            """, (session_id,))
+            conn.commit()
+            history = self._fetch_history(conn, session_id, 10)
+        
+        return self._build_session_context(row[2], row[3], history)
+    
+    def _build_session_context(self, user_id: str, metadata_json: str, history: List[Dict]) -> Dict:
+        """Assemble the context returned for a session from its row and recent history."""
+        metadata = json.loads(metadata_json)
+        return {
+            "user_id": user_id,
+            "preferences": metadata.get('preferences', {}),
+            "recent_history": history,
+            "job_references": self._extract_job_references(history)
+        }
     
     def _extract_job_references(self, history: List[Dict]) -> List[str]:
         """Extract job cluster IDs from conversation history."""
@@ -238,7 +371,7 @@ class SimplifiedSessionContextManager:
     
     def cleanup_expired_sessions(self):
         """Clean up expired sessions."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.execute("""
                 UPDATE sessions 
                 SET is_active = FALSE 
@@ -285,7 +418,7 @@ class SimplifiedSessionContextManager:
                 'current_jobs': context.current_jobs,
                 'preferences': context.preferences,
                 'last_query': context.last_query,
-                'job_history': context.job_history,
+                'job_history': list(context.job_history),
                 'updated_at': datetime.datetime.now().isoformat()
             })
             
@@ -307,7 +440,7 @@ class SimplifiedSessionContextManager:
             conversation_id = self.add_message(
                 session_id, 
                 "artifact", 
-                json.dumps(artifact_data, default=str)
+                json.dumps(artifact_data, default=_json_default)
             )
             
             logger.info(f"Saved artifact {artifact_data['artifact_id']} for session {session_id}")
@@ -320,7 +453,7 @@ class SimplifiedSessionContextManager:
     def load_artifact(self, session_id: str, name: str) -> Optional[Dict]:
         """Load an artifact from conversation history."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     SELECT content 
                     FROM conversations 
@@ -348,12 +481,13 @@ class SimplifiedSessionContextManager:
     def search_memory(self, user_id: str, query: str) -> List[Dict]:
         """Search memory in conversation history."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     SELECT c.content, c.message_type, s.user_id
                     FROM conversations c
                     JOIN sessions s ON c.session_id = s.session_id
                     WHERE (s.user_id = ? OR c.message_type = 'global_memory')
+                    AND c.message_type != 'tool_call'
                     AND (c.content LIKE ? OR c.content LIKE ?)
                     ORDER BY c.timestamp DESC
                 """, (user_id, f"%{query}%", f"%{query}%"))
@@ -390,10 +524,6 @@ class SimplifiedSessionContextManager:
         }
         context.job_history.append(job_entry)
         
-        # Keep only recent history
-        if len(context.job_history) > 50:
-            context.job_history = context.job_history[-50:]
-        
         # Save updated context
         self.save_htcondor_context(context.session_id, context)
     
@@ -411,7 +541,7 @@ class SimplifiedSessionContextManager:
             }
             
             # Find a session to attach this memory to (or create a system session)
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     SELECT session_id FROM sessions 
                     WHERE user_id = ? AND is_active = TRUE 
@@ -433,7 +563,7 @@ class SimplifiedSessionContextManager:
     def get_user_memory(self, user_id: str) -> Dict[str, Any]:
         """Get all memory for a user from conversation history."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     SELECT c.content FROM conversations c
                     JOIN sessions s ON c.session_id = s.session_id
@@ -457,7 +587,7 @@ class SimplifiedSessionContextManager:
     def get_global_memory(self) -> Dict[str, Any]:
         """Get global memory from conversation history."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 cursor = conn.execute("""
                     SELECT content FROM conversations 
                     WHERE message_type = 'global_memory'
@@ -480,7 +610,7 @@ class SimplifiedSessionContextManager:
     def cleanup_old_data(self, days: int = 30):
         """Clean up old conversation data."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute("""
                     DELETE FROM conversations 
                     WHERE timestamp < datetime('now', '-{} days')